@@ -1,6 +1,7 @@
 from datetime import datetime
 import csv
 from pathlib import Path
+from core.reference_filter import ReferenceFilter
 
 class FileOperations:
     def __init__(self):
@@ -12,6 +13,7 @@ class FileOperations:
             'CNP-MVNO': self.base_dir / 'data/cnp/mvno/CNP_MVNO_CURRENT.csv',
             'Treasury': self.base_dir / 'data/treasury/TREASURY_CURRENT.csv'
         }
+        self.reference_filter = None
         self._ensure_directories()
 
     def _ensure_directories(self):
@@ -238,6 +240,26 @@ class FileOperations:
         file_path.parent.mkdir(parents=True, exist_ok=True)
         return file_path
 
+    def read_treasury_file(self, file_path=None):
+        """Read all records from the current (or a given) Treasury file"""
+        file_path = Path(file_path) if file_path else self.file_paths['Treasury']
+        if not file_path.exists():
+            return []
+        with open(file_path, 'r', newline='', encoding='utf-8') as file:
+            return list(csv.DictReader(file))
+
+    def list_treasury_archives(self):
+        """List archived monthly Treasury files (TREASURY_<period>.csv)"""
+        current = self.file_paths['Treasury']
+        return sorted(path for path in current.parent.glob('**/TREASURY_*.csv')
+                      if path != current)
+
+    def get_reference_filter(self):
+        """Get the duplicate reference detector, building it on first use"""
+        if self.reference_filter is None:
+            self.reference_filter = ReferenceFilter(self)
+        return self.reference_filter
+
     def save_payment(self, payment_data):
         """Save payment to Treasury with Under Process status"""
         try:
@@ -269,6 +291,9 @@ class FileOperations:
                 writer.writeheader()
                 writer.writerows(existing_payments)
             
+            if self.reference_filter is not None:
+                self.reference_filter.add(new_payment['reference'])
+            
             return True, "Payment added to Treasury successfully"
         except Exception as e:
             error_msg = f"Error saving to Treasury: {str(e)}"
@@ -0,0 +1,176 @@
+from pathlib import Path
+import hashlib
+import json
+import math
+import os
+import threading
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        """Add a value to the filter"""
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+    def to_bytes(self, meta=None):
+        """Serialize as a JSON header line followed by the raw bit array"""
+        header = {
+            'capacity': self.capacity,
+            'error_rate': self.error_rate,
+            'count': self.count,
+            'meta': meta or {}
+        }
+        return json.dumps(header).encode('utf-8') + b'\n' + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a filter, returns (filter, meta)"""
+        header_line, bits = data.split(b'\n', 1)
+        header = json.loads(header_line)
+        bloom = cls(header['capacity'], header['error_rate'])
+        if len(bits) != len(bloom.bits):
+            raise ValueError("Bloom filter size does not match its header")
+        bloom.bits = bytearray(bits)
+        bloom.count = header['count']
+        return bloom, header.get('meta', {})
+
+
+class ReferenceFilter:
+    """Duplicate Treasury reference detector.
+
+    Current-month references are kept in an exact set. Every reference ever
+    seen, including archived months, goes into a Bloom filter persisted next
+    to the Treasury files, so most new references are ruled out without
+    reading any CSV. Bloom hits outside the current month are confirmed
+    against the archives on disk.
+    """
+
+    def __init__(self, file_handler, capacity=1000000, error_rate=0.001):
+        self.file_handler = file_handler
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter_file = file_handler.get_file_path('Treasury').parent / 'reference_filter.bin'
+        self.current_references = set()
+        self.bloom = None
+        self.sources = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self._load()
+
+    def _source_signature(self, path):
+        stat = path.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _load(self):
+        """Load the persisted filter and fold in any archives it has not seen"""
+        self.current_references = {
+            row['reference'] for row in self.file_handler.read_treasury_file()
+            if row.get('reference')
+        }
+
+        archives = {path.name: path for path in self.file_handler.list_treasury_archives()}
+        try:
+            self.bloom, meta = BloomFilter.from_bytes(self.filter_file.read_bytes())
+            self.sources = meta.get('sources', {})
+            # A filter that has grown before keeps its size across restarts
+            self.capacity = max(self.capacity, self.bloom.capacity)
+        except (OSError, ValueError, KeyError):
+            self.bloom, self.sources = None, {}
+
+        # Archives are append-only; a changed or vanished one forces a rebuild
+        changed = [name for name, sig in self.sources.items()
+                   if name not in archives or sig != self._source_signature(archives[name])]
+        if self.bloom is None or changed:
+            self.bloom = BloomFilter(self.capacity, self.error_rate)
+            self.sources = {}
+
+        for name, path in archives.items():
+            if name not in self.sources:
+                for reference in self._read_references(path):
+                    self.bloom.add(reference)
+                self.sources[name] = self._source_signature(path)
+                self.dirty = True
+
+        for reference in self.current_references:
+            if reference not in self.bloom:
+                self.bloom.add(reference)
+                self.dirty = True
+
+        if self.bloom.count > self.bloom.capacity:
+            self._grow()
+        self.save()
+
+    def _grow(self):
+        """Rebuild with doubled capacity once the false-positive budget is spent"""
+        while self.capacity < self.bloom.count:
+            self.capacity *= 2
+        self.bloom = BloomFilter(self.capacity, self.error_rate)
+        self.sources = {}
+        for path in self.file_handler.list_treasury_archives():
+            for reference in self._read_references(path):
+                self.bloom.add(reference)
+            self.sources[path.name] = self._source_signature(path)
+        for reference in self.current_references:
+            self.bloom.add(reference)
+        self.dirty = True
+
+    def _read_references(self, path):
+        for row in self.file_handler.read_treasury_file(path):
+            if row.get('reference'):
+                yield row['reference']
+
+    def is_duplicate(self, reference):
+        """Check whether a reference has been used before"""
+        with self.lock:
+            if reference in self.current_references:
+                return True
+            if reference not in self.bloom:
+                return False
+        # Possible archived duplicate (or a false positive): confirm on disk
+        for path in self.file_handler.list_treasury_archives():
+            if any(ref == reference for ref in self._read_references(path)):
+                return True
+        return False
+
+    def add(self, reference):
+        """Record a reference written to the current Treasury file"""
+        with self.lock:
+            self.current_references.add(reference)
+            self.bloom.add(reference)
+            self.dirty = True
+            if self.bloom.count > self.bloom.capacity:
+                self._grow()
+
+    def save(self):
+        """Persist the Bloom filter atomically if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            temp_file = self.filter_file.with_suffix('.tmp')
+            with open(temp_file, 'wb') as f:
+                f.write(self.bloom.to_bytes({'sources': self.sources}))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.filter_file)
+            self.dirty = False
@@ -51,7 +51,71 @@ def test_basic_validation():
     print(f"Result: {'PASS' if not result['valid'] else 'FAIL'}")
     print(f"Error: {result['error']}")
 
+def test_rule_stats():
+    """Test per-rule counters of the compiled validator"""
+    validation = ValidationSystem()
+    validation.validator.reset_stats()
+    
+    # Test Case 5: Cheapest rule short-circuits the pass
+    result = validation.validate_form({
+        'company': 'UNKNOWN',
+        'beneficiary': 'Test Company',
+        'reference': '123-456',
+        'amount': '100.00',
+        'date': datetime.now().strftime('%Y-%m-%d')
+    })
+    stats = validation.get_rule_stats()
+    print("\nTest Case 5: Rule Stats")
+    print(f"Result: {'PASS' if not result['valid'] and stats['company']['failures'] == 1 and stats['form_amount']['calls'] == 0 else 'FAIL'}")
+    print(f"Error: {result['error']}")
+
+def test_iban_checksum():
+    """Test IBAN mod-97 checksum validation"""
+    validation = ValidationSystem()
+    
+    # Test Case 6: Valid and corrupted IBANs in one batch
+    valid_iban = 'SA0380000000608010167519'
+    corrupted_iban = 'SA0380000000608010167518'
+    results = validation.validate_ibans([valid_iban, corrupted_iban, 'SA03', valid_iban])
+    print("\nTest Case 6: IBAN Checksum")
+    print(f"Result: {'PASS' if [valid for valid, _ in results] == [True, False, False, True] else 'FAIL'}")
+    print(f"Error: {results[1][1]}")
+    print(f"Cache: {validation.get_iban_cache_stats()}")
+
+def test_form_profile():
+    """Test that the Payments tab keeps its basic checks"""
+    validation = ValidationSystem()
+    
+    # Test Case 7: Existing free-form references and large amounts are still accepted
+    result = validation.validate_form({
+        'company': 'SALAM',
+        'beneficiary': 'Test Company',
+        'reference': 'ASDASD',
+        'amount': '2500000.00',
+        'date': '2020-01-18'
+    })
+    print("\nTest Case 7: Form Profile")
+    print(f"Result: {'PASS' if result['valid'] and result['cnp_required'] else 'FAIL'}")
+    print(f"Error: {result['error']}")
+    
+    # Test Case 8: Beneficiary errors come in the same order from both entry points
+    beneficiary = {'name': 'X', 'account': 'SA03', 'bank': ''}
+    _, direct_error = validation.validate_beneficiary(beneficiary)
+    _, payment_error = validation.validate_payment_data({
+        'company': 'SALAM',
+        'beneficiary': beneficiary,
+        'reference': 'ABC-2024-0001',
+        'amount': '100.00',
+        'date': datetime.now()
+    })
+    print("\nTest Case 8: Beneficiary Rule Order")
+    print(f"Result: {'PASS' if direct_error == payment_error == 'Beneficiary name too short' else 'FAIL'}")
+    print(f"Error: {payment_error}")
+
 if __name__ == '__main__':
     print("Starting Simple Validation Tests...")
     test_basic_validation()
+    test_rule_stats()
+    test_iban_checksum()
+    test_form_profile()
     print("\nTesting Complete!")
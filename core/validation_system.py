@@ -1,134 +1,348 @@
 from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 import re
 from pathlib import Path
 import json
 import os
+import threading
+import time
+
+# Patterns are compiled once at import time and shared by every rule
+COMPANY_NAMES = ('SALAM', 'MVNO')
+NAME_INVALID_CHARS = re.compile(r'[<>{}\\[\]~`!@#$%^&*()+=]')
+IBAN_PATTERN = re.compile(r'^SA\d{22}$')
+REFERENCE_PATTERN = re.compile(r'^[A-Z]{3}-\d{4}-\d{4}$')
+FORM_DATE_FORMAT = '%Y-%m-%d'
+FORM_FIELDS = ('company', 'beneficiary', 'reference', 'amount', 'date')
+MAX_AMOUNT = Decimal('1000000')
+IBAN_LETTER_DIGITS = str.maketrans({chr(c): str(c - 55) for c in range(ord('A'), ord('Z') + 1)})
+IBAN_CACHE_SIZE = 8192
+PAYMENT_STATUSES = ('Pending', 'Under Process', 'Completed', 'Rejected')
+
+
+def check_company(company):
+    """Return an error message for an invalid company, None otherwise"""
+    if not company or not isinstance(company, str):
+        return "Company must be a non-empty string"
+    if company.strip().upper() not in COMPANY_NAMES:
+        return f"Company must be one of {list(COMPANY_NAMES)}"
+    return None
+
+
+def check_beneficiary_name(name):
+    """Return an error message for an invalid beneficiary name, None otherwise"""
+    if not name or not isinstance(name, str):
+        return "Invalid beneficiary name"
+    stripped = name.strip()
+    if len(stripped) < 2:
+        return "Beneficiary name too short"
+    if len(stripped) > 100:
+        return "Beneficiary name too long"
+    if NAME_INVALID_CHARS.search(name):
+        return "Beneficiary name contains invalid characters"
+    return None
+
+
+def iban_checksum_valid(iban):
+    """ISO 13616 mod-97 check of an uppercase, space-free IBAN"""
+    rearranged = iban[4:] + iban[:4]
+    if not rearranged.isdigit():
+        # Slow path: letters in the BBAN or country code become 10..35
+        rearranged = rearranged.translate(IBAN_LETTER_DIGITS)
+    return int(rearranged) % 97 == 1
+
+
+@lru_cache(maxsize=IBAN_CACHE_SIZE)
+def _check_iban(account):
+    if not IBAN_PATTERN.match(account):
+        return "Invalid IBAN format"
+    if not iban_checksum_valid(account):
+        return "Invalid IBAN checksum"
+    return None
+
+
+def check_account(account):
+    """Return an error message for an invalid IBAN, None otherwise"""
+    if not isinstance(account, str):
+        return "Account must be a string"
+    # Results are memoized: the same beneficiary accounts are paid repeatedly
+    return _check_iban(account)
+
+
+def check_bank(bank):
+    """Return an error message for an invalid bank name, None otherwise"""
+    if not bank or not isinstance(bank, str):
+        return "Invalid bank name"
+    if len(bank.strip()) < 2:
+        return "Bank name too short"
+    return None
+
+
+def check_reference(reference):
+    """Return an error message for an invalid reference, None otherwise"""
+    if not reference or not isinstance(reference, str):
+        return "Reference must be a non-empty string"
+    # Format: XXX-YYYY-NNNN
+    if not REFERENCE_PATTERN.match(reference):
+        return "Reference must be in format XXX-YYYY-NNNN"
+    # The pattern guarantees the year is four digits
+    year = int(reference[4:8])
+    current_year = datetime.now().year
+    if year < current_year - 1 or year > current_year + 1:
+        return "Reference year must be within ±1 year of current year"
+    return None
+
+
+def check_amount(amount):
+    """Return an error message for an invalid amount, None otherwise"""
+    try:
+        if not isinstance(amount, Decimal):
+            if isinstance(amount, (int, float)):
+                amount = Decimal(str(amount))
+            elif isinstance(amount, str):
+                amount = Decimal(amount)
+            else:
+                return "Invalid amount type"
+        if amount <= 0:
+            return "Amount must be greater than 0"
+        if amount > MAX_AMOUNT:
+            return "Amount exceeds maximum limit"
+        return None
+    except (InvalidOperation, ValueError, TypeError):
+        return "Invalid amount format"
+
+
+def check_date(date_obj):
+    """Return an error message for an invalid payment date, None otherwise"""
+    if not isinstance(date_obj, datetime):
+        return "Date must be a datetime object"
+    current_date = datetime.now().date()
+    payment_date = date_obj.date()
+    # Not too old (more than 1 year) and not in the future
+    if payment_date < (current_date - timedelta(days=365)):
+        return "Date too old"
+    if payment_date > current_date:
+        return "Future date not allowed"
+    return None
+
+
+def check_form_fields(data):
+    """Return an error message when Payments tab fields are missing, None otherwise"""
+    missing_fields = [field for field in FORM_FIELDS if field not in data]
+    if missing_fields:
+        return f"Missing required fields: {', '.join(missing_fields)}"
+    return None
+
+
+def check_form_amount(amount):
+    """Return an error message for a non-numeric or non-positive form amount, None otherwise"""
+    try:
+        if float(amount) <= 0:
+            return "Amount must be positive"
+    except (TypeError, ValueError):
+        return "Invalid amount format"
+    return None
+
+
+def check_form_date(date_str):
+    """Return an error message for a form date not in YYYY-MM-DD format, None otherwise"""
+    if isinstance(date_str, datetime):
+        return None
+    try:
+        datetime.strptime(date_str, FORM_DATE_FORMAT)
+    except (TypeError, ValueError):
+        return "Invalid date format (must be YYYY-MM-DD)"
+    return None
+
+
+class ValidationRule:
+    """A single named check over a payment dict.
+
+    ``check`` receives the whole payment dict and returns an error message
+    or None. Lower ``cost`` rules run first; rules of equal cost keep their
+    registration order, so a rule may rely on cheaper rules having passed.
+    """
+
+    def __init__(self, name, check, cost=1, profiles=('payment',)):
+        self.name = name
+        self.check = check
+        self.cost = cost
+        self.profiles = tuple(profiles)
+
+
+def _beneficiary(data):
+    """Beneficiary dict of a payment (validated by ``beneficiary_fields``)"""
+    return data.get('beneficiary')
+
+
+def _check_beneficiary_fields(data):
+    beneficiary = _beneficiary(data)
+    if not isinstance(beneficiary, dict):
+        return "Beneficiary must be a dictionary"
+    if not all(field in beneficiary for field in ('name', 'account', 'bank')):
+        return "Missing required beneficiary fields"
+    return None
+
+
+# Declarative rule registry. ``payment`` is the full PaymentProcessor input
+# (beneficiary dict, datetime date); ``form`` is the Payments tab input
+# (beneficiary name and YYYY-MM-DD date as plain strings), which keeps the
+# tab's basic field, company, amount and date-format checks only.
+# Beneficiary rules share a cost so they run in validate_beneficiary's
+# order: name, account, bank.
+RULE_REGISTRY = [
+    ValidationRule('form_fields', check_form_fields, cost=0, profiles=('form',)),
+    ValidationRule('company', lambda d: check_company(d.get('company')),
+                   cost=1, profiles=('payment', 'form')),
+    ValidationRule('beneficiary_fields', _check_beneficiary_fields, cost=1),
+    ValidationRule('beneficiary_name', lambda d: check_beneficiary_name(_beneficiary(d)['name']),
+                   cost=2),
+    ValidationRule('account', lambda d: check_account(_beneficiary(d)['account']), cost=2),
+    ValidationRule('bank', lambda d: check_bank(_beneficiary(d)['bank']), cost=2),
+    ValidationRule('reference', lambda d: check_reference(d.get('reference')), cost=2),
+    ValidationRule('amount', lambda d: check_amount(d.get('amount')), cost=3),
+    ValidationRule('form_amount', lambda d: check_form_amount(d.get('amount')),
+                   cost=3, profiles=('form',)),
+    ValidationRule('date', lambda d: check_date(d.get('date')), cost=3),
+    ValidationRule('form_date', lambda d: check_form_date(d.get('date')),
+                   cost=4, profiles=('form',)),
+]
+
+
+class CompiledValidator:
+    """Single-pass validator compiled from a rule registry.
+
+    Rules are ordered cheapest-first per profile at construction time and
+    evaluation stops at the first failure. Per-rule call, failure and
+    latency counters are kept for ``get_stats``.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.profiles = {}
+        for profile in sorted({p for rule in self.rules for p in rule.profiles}):
+            ordered = sorted((r for r in self.rules if profile in r.profiles),
+                             key=lambda r: r.cost)
+            self.profiles[profile] = tuple((r.name, r.check) for r in ordered)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def validate(self, data, profile='payment'):
+        """Run the profile's rules in order, returns (valid, error, rule_name)"""
+        if not isinstance(data, dict):
+            return False, "Payment data must be a dictionary", None
+        timings = []
+        error = None
+        failed_rule = None
+        clock = time.perf_counter_ns
+        for name, check in self.profiles[profile]:
+            start = clock()
+            try:
+                error = check(data)
+            except Exception as e:
+                error = f"Validation error in {name}: {str(e)}"
+            timings.append((name, clock() - start))
+            if error is not None:
+                failed_rule = name
+                break
+        self._record(timings, failed_rule)
+        return error is None, error, failed_rule
+
+    def _record(self, timings, failed_rule):
+        """Fold one validation pass into the counters"""
+        with self._lock:
+            for name, elapsed in timings:
+                stats = self._stats[name]
+                stats['calls'] += 1
+                stats['total_ns'] += elapsed
+            if failed_rule is not None:
+                self._stats[failed_rule]['failures'] += 1
+
+    def get_stats(self):
+        """Per-rule hit and latency counters"""
+        with self._lock:
+            return {
+                name: {
+                    'calls': s['calls'],
+                    'failures': s['failures'],
+                    'total_ms': s['total_ns'] / 1e6,
+                    'avg_us': (s['total_ns'] / s['calls'] / 1e3) if s['calls'] else 0.0
+                }
+                for name, s in self._stats.items()
+            }
+
+    def reset_stats(self):
+        """Clear all per-rule counters"""
+        with self._lock:
+            self._stats = {rule.name: {'calls': 0, 'failures': 0, 'total_ns': 0}
+                           for rule in self.rules}
+
+
+_validator = None
+_validator_lock = threading.Lock()
+
+
+def get_validator():
+    """Process-wide compiled validator shared by the UI and PaymentProcessor"""
+    global _validator
+    if _validator is None:
+        with _validator_lock:
+            if _validator is None:
+                _validator = CompiledValidator(RULE_REGISTRY)
+    return _validator
+
 
 class ValidationSystem:
     def __init__(self):
         self.threshold_amount = Decimal('15000.00')
         self.tolerance = Decimal('0.01')  # 1% tolerance
         self.base_dir = Path(__file__).parent.parent
-        self.allowed_companies = ['SALAM', 'MVNO']
+        self.allowed_companies = list(COMPANY_NAMES)
+        self.validator = get_validator()
+
+    def _as_result(self, error):
+        """Convert a check's error message into a (valid, error) tuple"""
+        return error is None, error
 
     def validate_company(self, company):
         """Validate company name"""
-        if not company or not isinstance(company, str):
-            return False, "Company must be a non-empty string"
-            
-        company = company.strip().upper()
-        if company not in self.allowed_companies:
-            return False, f"Company must be one of {self.allowed_companies}"
-            
-        return True, None
+        return self._as_result(check_company(company))
 
     def validate_beneficiary(self, beneficiary):
         """Validate beneficiary details"""
-        if not isinstance(beneficiary, dict):
-            return False, "Beneficiary must be a dictionary"
-            
-        required_fields = ['name', 'account', 'bank']
-        if not all(field in beneficiary for field in required_fields):
-            return False, "Missing required beneficiary fields"
-            
-        # Validate name
-        name = beneficiary['name']
-        if not name or not isinstance(name, str):
-            return False, "Invalid beneficiary name"
-            
-        # Check name length
-        if len(name.strip()) < 2:
-            return False, "Beneficiary name too short"
-            
-        if len(name.strip()) > 100:
-            return False, "Beneficiary name too long"
-            
-        # Check for special characters in name
-        if re.search(r'[<>{}\\[\]~`!@#$%^&*()+=]', name):
-            return False, "Beneficiary name contains invalid characters"
-            
-        # Validate account (IBAN format for Saudi Arabia)
-        account = beneficiary['account']
-        if not isinstance(account, str):
-            return False, "Account must be a string"
-            
-        # Simplified IBAN check - just check format
-        if not re.match(r'^SA\d{22}$', account):
-            return False, "Invalid IBAN format"
-            
-        # Validate bank name
-        bank = beneficiary['bank']
-        if not bank or not isinstance(bank, str):
-            return False, "Invalid bank name"
-            
-        if len(bank.strip()) < 2:
-            return False, "Bank name too short"
-            
-        return True, None
+        error = _check_beneficiary_fields({'beneficiary': beneficiary})
+        if error is None:
+            error = (check_beneficiary_name(beneficiary['name'])
+                     or check_account(beneficiary['account'])
+                     or check_bank(beneficiary['bank']))
+        return self._as_result(error)
 
     def validate_reference(self, reference):
         """Validate reference number format"""
-        if not reference or not isinstance(reference, str):
-            return False, "Reference must be a non-empty string"
-            
-        # Format: XXX-YYYY-NNNN
-        if not re.match(r'^[A-Z]{3}-\d{4}-\d{4}$', reference):
-            return False, "Reference must be in format XXX-YYYY-NNNN"
-            
-        # Extract year
-        try:
-            year = int(reference.split('-')[1])
-            current_year = datetime.now().year
-            if year < current_year - 1 or year > current_year + 1:
-                return False, "Reference year must be within ±1 year of current year"
-        except (IndexError, ValueError):
-            return False, "Invalid reference year format"
-            
-        return True, None
+        return self._as_result(check_reference(reference))
 
     def validate_amount(self, amount):
         """Validate payment amount"""
-        try:
-            # Convert to Decimal if not already
-            if not isinstance(amount, Decimal):
-                if isinstance(amount, (int, float)):
-                    amount = Decimal(str(amount))
-                elif isinstance(amount, str):
-                    amount = Decimal(amount)
-                else:
-                    return False, "Invalid amount type"
-
-            # Check if amount is positive
-            if amount <= Decimal('0'):
-                return False, "Amount must be greater than 0"
-                
-            # Check if amount is within limits
-            if amount > Decimal('1000000'):
-                return False, "Amount exceeds maximum limit"
-                
-            return True, None
-            
-        except (InvalidOperation, ValueError, TypeError):
-            return False, "Invalid amount format"
+        return self._as_result(check_amount(amount))
 
     def validate_date(self, date_obj):
         """Validate payment date"""
-        if not isinstance(date_obj, datetime):
-            return False, "Date must be a datetime object"
-            
-        current_date = datetime.now().date()
-        payment_date = date_obj.date()
-        
-        # Check if date is not too old (more than 1 year)
-        if payment_date < (current_date - timedelta(days=365)):
-            return False, "Date too old"
-            
-        # Check if date is not in future
-        if payment_date > current_date:
-            return False, "Future date not allowed"
-            
-        return True, None
+        return self._as_result(check_date(date_obj))
+
+    def validate_ibans(self, accounts):
+        """Validate many IBANs at once, returns a (valid, error) tuple per account"""
+        return [self._as_result(check_account(account)) for account in accounts]
+
+    def get_iban_cache_stats(self):
+        """Hit/miss counters of the memoized IBAN check"""
+        info = _check_iban.cache_info()
+        return {'hits': info.hits, 'misses': info.misses,
+                'size': info.currsize, 'max_size': info.maxsize}
+
+    def get_rule_stats(self):
+        """Per-rule hit and latency counters of the shared validator"""
+        return self.validator.get_stats()
 
     def validate_payment_data(self, data):
         """Validate complete payment data"""
@@ -142,82 +356,34 @@ class ValidationSystem:
         if missing_fields:
             return False, f"Missing required fields: {', '.join(missing_fields)}"
             
-        # Validate each field
-        company_valid, company_error = self.validate_company(data['company'])
-        if not company_valid:
-            return False, company_error
-            
-        ref_valid, ref_error = self.validate_reference(data['reference'])
-        if not ref_valid:
-            return False, ref_error
-            
-        amount_valid, amount_error = self.validate_amount(data['amount'])
-        if not amount_valid:
-            return False, amount_error
-            
-        date_valid, date_error = self.validate_date(data['date'])
-        if not date_valid:
-            return False, date_error
-            
-        ben_valid, ben_error = self.validate_beneficiary(data['beneficiary'])
-        if not ben_valid:
-            return False, ben_error
-            
-        return True, None
+        valid, error, _ = self.validator.validate(data, 'payment')
+        return valid, error
 
     def validate_input(self, data):
         """Validate all input fields and return validation result"""
-        result = {'valid': True, 'error': None, 'cnp_required': False}
-        
-        # Validate company
-        company_valid, company_error = self.validate_company(data.get('company'))
-        if not company_valid:
-            result['valid'] = False
-            result['error'] = company_error
-            return result
-            
-        # Validate beneficiary
-        ben_valid, ben_error = self.validate_beneficiary(data.get('beneficiary'))
-        if not ben_valid:
-            result['valid'] = False
-            result['error'] = ben_error
-            return result
-            
-        # Validate reference number
-        ref_valid, ref_error = self.validate_reference(data.get('reference'))
-        if not ref_valid:
-            result['valid'] = False
-            result['error'] = ref_error
-            return result
-            
-        # Validate amount
-        amount_valid, amount_error = self.validate_amount(data.get('amount'))
-        if not amount_valid:
-            result['valid'] = False
-            result['error'] = amount_error
-            return result
-            
-        # Validate date
-        date_valid, date_error = self.validate_date(data.get('date'))
-        if not date_valid:
-            result['valid'] = False
-            result['error'] = date_error
-            return result
-            
-        result['cnp_required'] = date_valid and date_error is None
-        return result
+        valid, error, _ = self.validator.validate(data, 'payment')
+        return {'valid': valid, 'error': error, 'cnp_required': valid}
+
+    def validate_form(self, data):
+        """Validate Payments tab form input (string beneficiary and date)"""
+        valid, error, _ = self.validator.validate(data, 'form')
+        cnp_required = False
+        if valid:
+            date_value = data['date']
+            if not isinstance(date_value, datetime):
+                date_value = datetime.strptime(date_value, FORM_DATE_FORMAT)
+            today = datetime.now()
+            cnp_required = (date_value.year, date_value.month) < (today.year, today.month)
+        return {'valid': valid, 'error': error, 'cnp_required': cnp_required}
 
     def cross_reference_check(self, payment, file_handler):
         """Check for duplicate references in existing files"""
         result = {'valid': True, 'error': None}
         
         try:
-            existing_payments = file_handler.read_treasury_file()
-            for existing in existing_payments:
-                if existing['reference'] == payment['reference']:
-                    result['valid'] = False
-                    result['error'] = f"Reference {payment['reference']} already exists in the system"
-                    break
+            if file_handler.get_reference_filter().is_duplicate(payment['reference']):
+                result['valid'] = False
+                result['error'] = f"Reference {payment['reference']} already exists in the system"
         except Exception as e:
             result['valid'] = False
             result['error'] = f"Error checking reference: {str(e)}"
@@ -270,7 +436,15 @@ class ValidationSystem:
             elif not self._validate_json_file(path):
                 errors.append(f"Invalid JSON file: {path}")
                 
-        # Validate payment data
+        errors.extend(self._validate_status_payment(payment_data))
+        return {
+            'valid': len(errors) == 0,
+            'errors': errors
+        }
+        
+    def _validate_status_payment(self, payment_data):
+        """Errors in the payment data of a status update, without touching any file"""
+        errors = []
         if not isinstance(payment_data, dict):
             errors.append("Payment data must be a dictionary")
         else:
@@ -286,13 +460,9 @@ class ValidationSystem:
                 status = payment_data['status']
                 if not isinstance(status, str):
                     errors.append("Status must be a string")
-                elif status not in ['Pending', 'Under Process', 'Completed', 'Rejected']:
+                elif status not in PAYMENT_STATUSES:
                     errors.append("Invalid status value")
-                    
-        return {
-            'valid': len(errors) == 0,
-            'errors': errors
-        }
+        return errors
         
     def _validate_file_path(self, path_str):
         """Validate file path exists"""
@@ -319,48 +489,100 @@ class ValidationSystem:
 
     def update_payment_status(self, payment_data, file_paths):
         """Update payment status"""
-        validation_result = self.validate_status_update(payment_data, file_paths)
-        if not validation_result['valid']:
-            return {'updated': 0, 'errors': validation_result['errors']}
-            
+        # Files are checked while they are applied, so each one is parsed only once
+        errors = [] if file_paths else ["No file paths provided"]
+        errors.extend(self._validate_status_payment(payment_data))
+        if errors:
+            return {'updated': 0, 'errors': errors}
+            
+        return self._apply_status_updates(
+            {payment_data['reference']: payment_data['status']}, file_paths)
+
+    def update_payment_statuses(self, status_updates, file_paths):
+        """Update the status of many payments in one pass over the files.
+
+        ``status_updates`` maps reference to new status. Each file is parsed
+        once, matched through a reference index and rewritten atomically
+        only if something in it changed.
+        """
+        errors = []
+        if not file_paths:
+            errors.append("No file paths provided")
+        if not isinstance(status_updates, dict) or not status_updates:
+            errors.append("Status updates must be a non-empty dictionary")
+        else:
+            for reference, status in status_updates.items():
+                if not reference:
+                    errors.append("Reference cannot be empty")
+                elif status not in PAYMENT_STATUSES:
+                    errors.append(f"Invalid status value for {reference}")
+        if errors:
+            return {'updated': 0, 'errors': errors, 'not_found': []}
+        return self._apply_status_updates(status_updates, file_paths)
+
+    def _apply_status_updates(self, status_updates, file_paths):
+        """Apply reference -> status updates, loading and writing each file once"""
         updated_count = 0
         errors = []
+        found = set()
         
-        try:
-            for path in file_paths:
-                if not self._validate_file_path(path) or not self._validate_json_file(path):
+        for path in file_paths:
+            path = Path(path)
+            if path.suffix != '.json' or not path.exists():
+                errors.append(f"Invalid file path: {path}")
+                continue
+                
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+                errors.append(f"Invalid JSON format in file: {path}")
+                continue
+                
+            if not isinstance(data, dict) or not isinstance(data.get('payments'), list):
+                errors.append(f"Invalid data structure in file: {path}")
+                continue
+                
+            # Index the file's payments by reference, then probe it per update
+            index = {}
+            skipped = 0
+            for payment in data['payments']:
+                if not isinstance(payment, dict):
+                    skipped += 1
                     continue
+                index.setdefault(payment.get('reference'), []).append(payment)
+            if skipped:
+                errors.append(f"Invalid data structure in file: {path} ({skipped} payment entries skipped)")
+                
+            file_updates = 0
+            for reference, status in status_updates.items():
+                for payment in index.get(reference, ()):
+                    payment['status'] = status
+                    file_updates += 1
+                    found.add(reference)
                     
+            if file_updates:
                 try:
-                    with open(path, 'r') as f:
-                        data = json.load(f)
-                except (json.JSONDecodeError, UnicodeDecodeError):
-                    errors.append(f"Invalid JSON format in file: {path}")
-                    continue
-                    
-                if 'payments' not in data:
-                    errors.append(f"Invalid data structure in file: {path}")
-                    continue
+                    self._write_json_atomic(path, data)
+                    updated_count += file_updates
+                except Exception as e:
+                    errors.append(f"Error writing to file {path}: {str(e)}")
                     
-                modified = False
-                for payment in data['payments']:
-                    if payment.get('reference') == payment_data['reference']:
-                        payment['status'] = payment_data['status']
-                        modified = True
-                        updated_count += 1
-                        
-                if modified:
-                    try:
-                        with open(path, 'w') as f:
-                            json.dump(data, f, indent=4)
-                    except Exception as e:
-                        errors.append(f"Error writing to file {path}: {str(e)}")
-                        updated_count -= 1
-                        
-        except Exception as e:
-            errors.append(f"Error updating status: {str(e)}")
-            
         return {
             'updated': updated_count,
-            'errors': errors
+            'errors': errors,
+            'not_found': [ref for ref in status_updates if ref not in found]
         }
+
+    def _write_json_atomic(self, path, data):
+        """Write JSON to a sibling temp file and rename it over the target"""
+        temp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
@@ -40,6 +40,7 @@ class PaymentSystem:
         
         # Initialize notification state
         self.notification_count = 0
+        self.notification_counts = {}  # source -> count
         self.notification_labels = []
         
         # Show login window first
@@ -91,7 +92,7 @@ class PaymentSystem:
         self.notebook.add(self.lg_tab.lg_frame, text="LGs")
         
         # Create Todo tab
-        todo_tab = TodoTab(self.notebook, self.current_user)
+        todo_tab = TodoTab(self.notebook, self.current_user, self)
         self.notebook.add(todo_tab.main_frame, text="To Do List")
         
         # Create Folder Management tab
@@ -115,8 +116,10 @@ class PaymentSystem:
         # Schedule periodic updates for LGs
         self.root.after(1000, self.check_lg_updates)
 
-    def update_all_notifications(self, count):
-        """Update notification count across all tabs"""
+    def update_all_notifications(self, count, source='lg'):
+        """Update one source's notification count and show the total across all tabs"""
+        self.notification_counts[source] = count
+        count = sum(self.notification_counts.values())
         self.notification_count = count
         for label in self.notification_labels:
             if label and label.winfo_exists():
@@ -447,11 +450,11 @@ class PaymentSystem:
                 self.show_in_results("\n This is an old payment. Please ensure you check 'Process as Exception' box.", "warning")
                 return False
             
-            # Use ValidationSystem for comprehensive validation
-            validation_result = self.validation_system.validate_input(payment_data)
+            # Use the shared compiled validator for the form input
+            validation_result = self.validation_system.validate_form(payment_data)
             
             if not validation_result['valid']:
-                error_msg = "\n".join(validation_result['errors'])
+                error_msg = validation_result['error']
                 self.show_in_results(f"\nValidation failed:\n{error_msg}", "error")
                 return False
             
@@ -813,68 +816,6 @@ Do you want to proceed with this payment?"""
             # Show login window
             self.show_login()
 
-class ValidationSystem:
-    def validate_input(self, payment_data):
-        """
-        Basic validation of payment data
-        Returns dict with 'valid' boolean and 'errors' list
-        """
-        errors = []
-        date_obj = None
-        
-        try:
-            # Check data types and required fields
-            if not isinstance(payment_data, dict):
-                return {'valid': False, 'errors': ['Payment data must be a dictionary']}
-                
-            required_fields = ['company', 'beneficiary', 'reference', 'amount', 'date']
-            missing_fields = [field for field in required_fields if field not in payment_data]
-            if missing_fields:
-                return {'valid': False, 'errors': [f'Missing required fields: {", ".join(missing_fields)}']}
-                
-            # Basic field validations
-            if payment_data['company'] not in ['SALAM', 'MVNO']:
-                errors.append('Company must be either SALAM or MVNO')
-                
-            # Amount validation - only check if it's a valid number
-            amount = payment_data['amount']
-            try:
-                amount_float = float(amount)
-                if amount_float <= 0:
-                    errors.append('Amount must be positive')
-            except ValueError:
-                errors.append('Invalid amount format')
-                
-            # Date validation - only check if it's a valid date
-            date = payment_data['date']
-            try:
-                date_obj = datetime.strptime(date, '%Y-%m-%d')
-            except ValueError:
-                errors.append('Invalid date format (must be YYYY-MM-DD)')
-                
-            # Return result with CNP check if no errors
-            if len(errors) == 0 and date_obj is not None:
-                current_month = datetime.strptime('2025-01-16', '%Y-%m-%d').replace(day=1)
-                payment_month = date_obj.replace(day=1)
-                cnp_required = payment_month < current_month
-            
-                return {
-                    'valid': True,
-                    'errors': [],
-                    'cnp_required': cnp_required
-                }
-            
-            return {
-                'valid': len(errors) == 0,
-                'errors': errors
-            }
-            
-        except Exception as e:
-            return {
-                'valid': False,
-                'errors': [f'Validation error: {str(e)}']
-            }
-
 def main():
     from ui.splash_screen import SplashScreen
     
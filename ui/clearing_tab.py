@@ -2,11 +2,26 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
 import json
+import os
+import pickle
 from pathlib import Path
 from datetime import datetime
 import re
+import heapq
+import threading
+import queue
+import openpyxl
 
 class ClearingTab:
+    ROW_BUFFER = 50  # Rows materialized above and below the visible window
+    SEARCH_DELAY_MS = 250  # Typing pause before the table is refiltered
+    SEARCH_COLUMNS = ("Month", "Transaction Number", "Vendor Name")
+    IMPORT_CHUNK_ROWS = 5000  # Rows the import worker hands to the UI at a time
+    IMPORT_POLL_MS = 50  # How often the UI drains the import queue
+    CACHE_PROTOCOL = 5  # Pickle protocol of the binary data cache
+    VENDOR_SUGGESTIONS = 200  # Most frequent matching vendors listed in the vendor search
+    VENDOR_SCAN_FACTOR = 4  # Trigram hits above this many times the limit are scanned in rank order
+    
     def __init__(self, parent, main_app):
         self.parent = parent
         self.main_app = main_app
@@ -30,6 +45,29 @@ class ClearingTab:
             'Amount', 'Notes', 'Comments'
         ])
         
+        # Virtual table state: the tree only holds rows window_start..window_end
+        self.view_df = self.df
+        self.first_row = 0
+        self.window_start = 0
+        self.window_end = 0
+        self.shown_rows = None  # Rows the tree reported showing at its current height
+
+        # Lowercase search text per "in:" choice, aligned with self.df's row order;
+        # None until the first search after a load
+        self.search_index = None
+        self.last_search = None  # (query, column, matching index, amount total) of the previous filter
+        self.amount_total = 0.0  # Sum of Amount over all rows
+        self.search_after_id = None
+        self.vendor_index = None  # Per-vendor counts, totals and row labels; None until first use
+        
+        # Background import state
+        self.import_thread = None
+        self.import_queue = queue.Queue()
+        self.import_cancel = threading.Event()
+        self.import_chunks = []
+        self.import_rows = 0
+        self.previous_df = None
+        
         # Setup UI
         self.setup_ui()
         
@@ -48,8 +86,18 @@ class ClearingTab:
         company_combo.bind('<<ComboboxSelected>>', self.on_company_change)
         
         # Import Excel button
-        ttk.Button(control_frame, text="Import Excel",
-                  command=self.import_excel).pack(side=tk.RIGHT, padx=5)
+        self.import_button = ttk.Button(control_frame, text="Import Excel",
+                                        command=self.import_excel)
+        self.import_button.pack(side=tk.RIGHT, padx=5)
+        
+        # Import progress, shown only while an import runs
+        self.import_frame = ttk.Frame(control_frame)
+        self.import_progress = ttk.Progressbar(self.import_frame, length=200, mode='determinate')
+        self.import_progress.pack(side=tk.LEFT, padx=5)
+        self.import_status_var = tk.StringVar()
+        ttk.Label(self.import_frame, textvariable=self.import_status_var).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.import_frame, text="Cancel",
+                  command=self.cancel_import).pack(side=tk.LEFT, padx=5)
         
         # Search frame
         search_frame = ttk.Frame(self.clearing_frame)
@@ -71,6 +119,7 @@ class ClearingTab:
                                                 "Transaction Number", "Vendor Name"],
                                          state="readonly")
         search_column_combo.pack(side=tk.LEFT, padx=5)
+        search_column_combo.bind('<<ComboboxSelected>>', self.on_search)
         
         # Reconcile dropdown
         ttk.Label(search_frame, text="Reconcile By:").pack(side=tk.LEFT, padx=5)
@@ -110,9 +159,9 @@ class ClearingTab:
         table_frame = ttk.Frame(self.clearing_frame)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        # Scrollbars
-        y_scrollbar = ttk.Scrollbar(table_frame)
-        y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Scrollbars; the vertical one spans the whole result set, not the tree
+        self.y_scrollbar = ttk.Scrollbar(table_frame, command=self.on_table_scroll)
+        self.y_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         x_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL)
         x_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
@@ -130,26 +179,33 @@ class ClearingTab:
             self.tree.column(col, width=100)
         
         # Configure scrollbars
-        self.tree.configure(yscrollcommand=y_scrollbar.set,
-                          xscrollcommand=x_scrollbar.set)
-        y_scrollbar.config(command=self.tree.yview)
+        self.tree.configure(xscrollcommand=x_scrollbar.set, yscrollcommand=self.on_tree_yview)
         x_scrollbar.config(command=self.tree.xview)
         
         # Pack tree
         self.tree.pack(fill=tk.BOTH, expand=True)
         
+        # Scrolling inside the tree moves through the virtual rows
+        self.tree.bind('<MouseWheel>', self.on_table_wheel)
+        self.tree.bind('<Button-4>', self.on_table_wheel)
+        self.tree.bind('<Button-5>', self.on_table_wheel)
+        self.tree.bind('<Configure>', self.on_tree_configure)
+        self.row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        
         # Configure column formats
         self.column_formats = {
             'Month': str,
             'Transaction Number': str,
             'Vendor Name': str,
-            'Amount': lambda x: f"{float(str(x).replace(',', '')):,.2f}",
+            'Amount': lambda x: f"{x:,.2f}",
             'Notes': str,
             'Comments': str
         }
         
     def import_excel(self):
-        """Import data from Excel file"""
+        """Import data from Excel file on a background thread"""
+        if self.import_thread is not None:
+            return
         try:
             filename = filedialog.askopenfilename(
                 title="Select Excel File",
@@ -157,23 +213,152 @@ class ClearingTab:
             )
             
             if filename:
-                # Read Excel file
-                df = pd.read_excel(filename)
+                self.previous_df = self.df
+                self.import_chunks = []
+                self.import_rows = 0
+                self.import_cancel.clear()
+                self.import_queue = queue.Queue()
                 
-                # Process data
-                self.df = self.process_excel_data(df)
+                self.import_button.configure(state='disabled')
+                self.import_progress.configure(value=0, maximum=1)
+                self.import_status_var.set("Opening workbook...")
+                self.import_frame.pack(side=tk.RIGHT, padx=5)
                 
-                # Save processed data
-                self.save_data()
+                self.import_thread = threading.Thread(
+                    target=self.read_excel_chunks,
+                    args=(filename, self.import_queue, self.import_cancel),
+                    daemon=True)
+                self.import_thread.start()
+                self.clearing_frame.after(self.IMPORT_POLL_MS, self.poll_import)
                 
-                # Update table
-                self.update_table()
-                self.update_summary()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to import Excel file: {str(e)}")
+
+    def read_excel_chunks(self, filename, chunks, cancel):
+        """Worker thread: stream the sheet's rows into the queue in chunks"""
+        try:
+            if filename.lower().endswith('.xls'):
+                # openpyxl cannot stream legacy .xls; read it in one piece
+                df = pd.read_excel(filename)
+                chunks.put(('start', len(df)))
+                chunks.put(('chunk', df))
+                chunks.put(('done', None))
+                return
                 
-                messagebox.showinfo("Success", "Data imported successfully!")
+            workbook = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+            try:
+                sheet = workbook.active
+                rows = sheet.iter_rows(values_only=True)
+                header = None
+                for row in rows:
+                    if any(value is not None for value in row):
+                        header = [str(value).strip() if value is not None else '' for value in row]
+                        break
+                if header is None:
+                    raise ValueError("The worksheet is empty")
+                width = len(header)
+                chunks.put(('start', max((sheet.max_row or 1) - 1, 0)))
                 
+                batch = []
+                for row in rows:
+                    if cancel.is_set():
+                        chunks.put(('cancelled', None))
+                        return
+                    # Read-only rows omit trailing empty cells
+                    batch.append(row[:width] + (None,) * (width - len(row)))
+                    if len(batch) >= self.IMPORT_CHUNK_ROWS:
+                        chunks.put(('chunk', pd.DataFrame(batch, columns=header)))
+                        batch = []
+                if batch:
+                    chunks.put(('chunk', pd.DataFrame(batch, columns=header)))
+            finally:
+                workbook.close()
+            chunks.put(('done', None))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to import Excel file: {str(e)}")
+            chunks.put(('error', str(e)))
+
+    def poll_import(self):
+        """UI thread: take finished chunks from the worker and show progress"""
+        while True:
+            try:
+                kind, payload = self.import_queue.get_nowait()
+            except queue.Empty:
+                break
+                
+            if kind == 'start':
+                if payload:
+                    self.import_progress.configure(maximum=payload)
+                else:
+                    # Row count not stored in the workbook
+                    self.import_progress.configure(mode='indeterminate')
+                    self.import_progress.start()
+            elif kind == 'chunk':
+                if self.import_cancel.is_set():
+                    continue
+                self.import_chunks.append(self.process_excel_data(payload))
+                self.import_rows += len(payload)
+                self.import_progress.configure(value=self.import_rows)
+                self.import_status_var.set(f"Imported {self.import_rows:,} rows")
+                if len(self.import_chunks) == 1:
+                    # Show the first rows while the rest is still being read
+                    self.df = self.import_chunks[0]
+                    self.build_search_index()
+                    self.update_table()
+            elif kind == 'done':
+                if self.import_cancel.is_set():
+                    self.end_import()
+                else:
+                    self.finish_import()
+                return
+            elif kind == 'cancelled':
+                self.end_import()
+                return
+            elif kind == 'error':
+                self.end_import()
+                messagebox.showerror("Error", f"Failed to import Excel file: {payload}")
+                return
+                
+        self.clearing_frame.after(self.IMPORT_POLL_MS, self.poll_import)
+
+    def finish_import(self):
+        """Combine the imported chunks, then save and show them"""
+        if self.import_chunks:
+            self.df = pd.concat(self.import_chunks, ignore_index=True)
+        else:
+            self.df = self.process_excel_data(pd.DataFrame())
+        self.import_chunks = []
+        self.previous_df = None
+        self.build_search_index()
+        
+        # Save processed data
+        self.save_data()
+        
+        # Update table
+        self.update_table()
+        self.update_summary()
+        self.end_import()
+        
+        messagebox.showinfo("Success", "Data imported successfully!")
+
+    def cancel_import(self):
+        """Stop a running import and keep the data shown before it"""
+        self.import_cancel.set()
+        self.import_status_var.set("Cancelling...")
+
+    def end_import(self):
+        """Hide the progress bar; a cancelled or failed import restores the previous data"""
+        if self.previous_df is not None:
+            self.df = self.previous_df
+            self.previous_df = None
+            self.build_search_index()
+            self.update_table()
+            self.update_summary()
+        self.import_chunks = []
+        self.import_thread = None
+        self.import_progress.stop()
+        self.import_progress.configure(mode='determinate')
+        self.import_frame.pack_forget()
+        self.import_button.configure(state='normal')
             
     def save_data(self):
         """Save data to JSON file"""
@@ -190,9 +375,44 @@ class ClearingTab:
             # Save to file
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=4)
+            self.write_cache(file_path, self.df)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save data: {str(e)}")
+
+    def cache_path(self, file_path):
+        """Binary cache stored next to a clearing JSON file"""
+        return file_path.with_suffix('.cache')
+
+    def source_signature(self, file_path):
+        """(mtime, size) of a JSON file, used to detect a stale cache"""
+        stat = file_path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read_cache(self, file_path):
+        """Normalized DataFrame from the binary cache, or None if it is missing or stale"""
+        cache_file = self.cache_path(file_path)
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('source') == self.source_signature(file_path):
+                return cached['df']
+        except Exception as e:
+            if cache_file.exists():
+                print(f"Ignoring clearing cache {cache_file.name}: {e}")
+        return None
+
+    def write_cache(self, file_path, df):
+        """Store the normalized DataFrame in the binary cache, keyed to the JSON's mtime and size"""
+        cache_file = self.cache_path(file_path)
+        temp_file = cache_file.with_suffix('.cache.tmp')
+        try:
+            with open(temp_file, 'wb') as f:
+                pickle.dump({'source': self.source_signature(file_path), 'df': df},
+                            f, protocol=self.CACHE_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except Exception as e:
+            print(f"Error writing clearing cache: {e}")
             
     def load_data(self):
         """Load data from JSON file"""
@@ -201,81 +421,294 @@ class ClearingTab:
             file_path = self.data_dir / f"{company}_clearing.json"
             
             if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.df = pd.DataFrame(data.get('records', []))
+                # The binary cache is only used while it matches the JSON file
+                df = self.read_cache(file_path)
+                if df is None:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    df = self.normalize_amounts(pd.DataFrame(data.get('records', [])))
+                    self.write_cache(file_path, df)
+                self.df = df
             else:
-                self.df = pd.DataFrame(columns=[
+                self.df = self.normalize_amounts(pd.DataFrame(columns=[
                     'Month', 'Transaction Number', 'Vendor Name', 
                     'Amount', 'Notes', 'Comments'
-                ])
+                ]))
+            self.build_search_index()
                 
             self.update_table()
             self.update_summary()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data: {str(e)}")
-            self.df = pd.DataFrame(columns=[
+            self.df = self.normalize_amounts(pd.DataFrame(columns=[
                 'Month', 'Transaction Number', 'Vendor Name', 
                 'Amount', 'Notes', 'Comments'
-            ])
+            ]))
+            self.build_search_index()
             
+    def process_excel_data(self, df):
+        """Shape an imported sheet into the clearing columns with a numeric Amount"""
+        df = df.rename(columns=lambda c: str(c).strip())
+        columns = ['Month', 'Transaction Number', 'Vendor Name', 'Amount', 'Notes', 'Comments']
+        for col in columns:
+            if col not in df.columns:
+                df[col] = ''
+        df = df[columns].copy()
+        for col in columns:
+            if col != 'Amount':
+                df[col] = df[col].fillna('').astype(str)
+        return self.normalize_amounts(df)
+
+    def normalize_amounts(self, df):
+        """Parse Amount (numbers or comma-formatted strings) to float once, at ingest"""
+        if 'Amount' not in df.columns:
+            df['Amount'] = 0.0
+        amounts = df['Amount']
+        if not pd.api.types.is_numeric_dtype(amounts):
+            text = amounts.fillna('').astype(str).str.replace(',', '', regex=False).str.strip()
+            amounts = pd.to_numeric(text, errors='coerce')
+            # Blank amounts count as 0.00; anything else unparseable is reported
+            unparsed = amounts.isna() & (text != '')
+            if unparsed.any():
+                rows = unparsed.to_numpy().nonzero()[0]
+                if 'Transaction Number' in df.columns:
+                    labels = [f"transaction {df['Transaction Number'].iloc[i]}" for i in rows[:5]]
+                else:
+                    labels = [f"row {i + 1}" for i in rows[:5]]
+                examples = ', '.join(f"{label}: {text.iloc[i]!r}" for label, i in zip(labels, rows))
+                print(f"Warning: {len(rows)} Amount value(s) could not be parsed and were set to 0.00 ({examples})")
+        df['Amount'] = amounts.astype(float).fillna(0.0)
+        return df
+
+    def build_search_index(self):
+        """Reset search state for newly loaded or imported data"""
+        self.df = self.df.reset_index(drop=True)
+        self.last_search = None
+        # The search text is built once, on the first search, to keep loads fast
+        self.search_index = None
+        self.vendor_index = None
+        self.amount_total = float(self.df['Amount'].sum()) if 'Amount' in self.df.columns else 0.0
+
+    def ensure_vendor_index(self):
+        """Build the vendor dictionary and its trigram index once per load or import"""
+        if self.vendor_index is not None:
+            return self.vendor_index
+        vendors = {}
+        trigrams = {}
+        if not self.df.empty:
+            # JSON data can hold numeric vendor names; group on their text as displayed
+            names = self.df['Vendor Name'].fillna('').astype(str)
+            groups = self.df['Amount'].groupby(names, sort=False)
+            totals = groups.sum()
+            # Row labels stay valid after sort_table, which keeps the index
+            rows = groups.indices
+            labels = self.df.index.to_numpy()
+            for name, count in groups.size().items():
+                if not name:
+                    continue
+                key = name.lower()
+                vendors[name] = {'key': key, 'count': int(count), 'total': float(totals[name]),
+                                 'rows': labels[rows[name]]}
+                for i in range(len(key) - 2):
+                    trigrams.setdefault(key[i:i + 3], set()).add(name)
+        ranked = [(vendors[name]['key'], name)
+                  for name in sorted(vendors, key=lambda name: -vendors[name]['count'])]
+        for rank, (_, name) in enumerate(ranked):
+            vendors[name]['rank'] = rank
+        self.vendor_index = {'vendors': vendors, 'ranked': ranked, 'trigrams': trigrams}
+        return self.vendor_index
+
+    def match_vendors(self, text, limit=None):
+        """Vendors whose name contains text, most transactions first"""
+        index = self.ensure_vendor_index()
+        vendors = index['vendors']
+        text = text.strip().lower()
+        if not text:
+            return []
+        postings = []
+        if len(text) >= 3:
+            postings = sorted((index['trigrams'].get(text[i:i + 3], ()) for i in range(len(text) - 2)),
+                              key=len)
+        if not postings or (limit and len(postings[0]) > self.VENDOR_SCAN_FACTOR * limit):
+            # Short or common text: scan vendors in rank order and stop at the limit
+            matches = []
+            for key, name in index['ranked']:
+                if text in key:
+                    matches.append(name)
+                    if len(matches) == limit:
+                        break
+            return matches
+        candidates = set(postings[0]).intersection(*postings[1:])
+        matches = [name for name in candidates if text in vendors[name]['key']]
+        rank = lambda name: vendors[name]['rank']
+        return heapq.nsmallest(limit, matches, key=rank) if limit else sorted(matches, key=rank)
+
+    def ensure_search_text(self):
+        """Precompute lowercase search text once per load or import"""
+        if self.search_index is not None:
+            return
+        self.search_index = {}
+        if self.df.empty:
+            return
+        text = {col: self.df[col].astype(str).str.lower() for col in self.df.columns if col != 'Amount'}
+        if 'Amount' in self.df.columns:
+            # Search amounts the way they are displayed
+            text['Amount'] = self.df['Amount'].map('{:,.2f}'.format)
+        columns = list(text.values())
+        # Unit separator keeps a query from matching across column boundaries
+        self.search_index["All Columns"] = columns[0].str.cat(columns[1:], sep='\x1f')
+        for col in self.SEARCH_COLUMNS:
+            if col in text:
+                self.search_index[col] = text[col]
+
+    def filter_rows(self, query, column):
+        """Rows of self.df whose search text contains the query (in table order) and their Amount total"""
+        query = query.lower()
+        self.ensure_search_text()
+        search_text = self.search_index.get(column, self.search_index.get("All Columns"))
+        if search_text is None:
+            return self.df.iloc[0:0], 0.0
+        
+        # A longer query can only match a subset of the previous matches
+        previous_total = None
+        if self.last_search and self.last_search[1] == column and query.startswith(self.last_search[0]):
+            search_text = search_text.loc[self.last_search[2]]
+            previous_total = self.last_search[3]
+        found = search_text.str.contains(query, regex=False, na=False).to_numpy()
+        matches = search_text.index[found]
+        
+        # Sum whichever side is smaller: the matches, or the rows the narrowing dropped
+        amounts = self.df['Amount']
+        if previous_total is not None and len(matches) > len(found) - len(matches):
+            total = previous_total - float(amounts.loc[search_text.index[~found]].sum())
+        else:
+            total = float(amounts.loc[matches].sum())
+        self.last_search = (query, column, matches, total)
+        return self.df.loc[matches], total
+
     def update_table(self):
         """Update the treeview with current data"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
         if self.df is None or len(self.df) == 0:
+            self.view_df = pd.DataFrame(columns=self.tree['columns'])
+            self.first_row = 0
+            self.render_window(force=True)
             self.total_amount_var.set("Total Amount: SAR 0.00")
             self.transaction_count_var.set("Transactions: 0")
             return
             
-        # Simple and fast search implementation
-        filtered_df = self.df.copy()
+        # Filter on the precomputed search text
+        filtered_df = self.df
+        total_amount = self.amount_total
         search_text = self.search_var.get().strip()
         if search_text:
-            filtered_df = filtered_df[
-                filtered_df.astype(str).apply(
-                    lambda x: x.str.contains(search_text, case=False, na=False)
-                ).any(axis=1)
-            ]
+            filtered_df, total_amount = self.filter_rows(search_text, self.search_column_var.get())
+        else:
+            self.last_search = None
+        self.total_amount_var.set(f"Total Amount: SAR {total_amount:,.2f}")
             
-        # Calculate total amount
-        try:
-            # Convert amount strings to numeric, handling commas
-            amounts = filtered_df['Amount'].apply(lambda x: float(str(x).replace(',', '')))
-            total_amount = amounts.sum()
-            self.total_amount_var.set(f"Total Amount: SAR {total_amount:,.2f}")
-        except Exception as e:
-            print(f"Error calculating total: {e}")
-            self.total_amount_var.set("Total Amount: SAR 0.00")
-            
-        # Bulk insert for better performance
-        for _, row in filtered_df.iterrows():
-            try:
-                values = []
-                for col in self.tree['columns']:
-                    formatter = self.column_formats.get(col, str)
-                    try:
-                        value = formatter(row[col])
-                    except:
-                        value = str(row[col])
-                    values.append(value)
-                self.tree.insert('', 'end', values=values)
-            except Exception as e:
-                print(f"Error inserting row: {e}")
-                continue
+        # Only the rows around the top of the view are put in the tree
+        self.view_df = filtered_df
+        self.first_row = 0
+        self.render_window(force=True)
                 
         # Update transaction count
         self.transaction_count_var.set(f"Transactions: {len(filtered_df)}")
         
+    def visible_row_count(self):
+        """Number of rows that fit in the tree's current height"""
+        # One row's worth of height goes to the headings; a taller heading is
+        # caught by the tree's own count, otherwise the last rows can't be reached
+        estimate = max(1, self.tree.winfo_height() // self.row_height - 1)
+        if self.shown_rows:
+            return min(estimate, self.shown_rows)
+        return estimate
+
+    def on_tree_configure(self, event):
+        """Re-measure and re-render after the tree is resized"""
+        self.shown_rows = None
+        self.render_window()
+
+    def render_window(self, force=False):
+        """Show view_df from first_row, re-materializing the tree window only when needed"""
+        total = len(self.view_df)
+        visible = self.visible_row_count()
+        self.first_row = max(0, min(self.first_row, total - visible))
+        last_row = min(total, self.first_row + visible)
+
+        # Re-window once the view is within a screen of a window edge that is not a data edge
+        near_top = self.window_start > 0 and self.first_row - self.window_start < visible
+        near_bottom = self.window_end < total and self.window_end - last_row < visible
+        if force or near_top or near_bottom:
+            # Item ids are view_df positions, so selection and focus survive a re-window
+            selection = () if force else self.tree.selection()
+            focus = '' if force else self.tree.focus()
+            self.tree.delete(*self.tree.get_children())
+            self.window_start = max(0, self.first_row - self.ROW_BUFFER)
+            self.window_end = min(total, last_row + self.ROW_BUFFER)
+            columns = self.tree['columns']
+            window = self.view_df.iloc[self.window_start:self.window_end].reindex(columns=list(columns))
+            for position, row in enumerate(window.itertuples(index=False), self.window_start):
+                values = []
+                for col, raw in zip(columns, row):
+                    formatter = self.column_formats.get(col, str)
+                    try:
+                        value = formatter(raw)
+                    except Exception:
+                        value = str(raw)
+                    values.append(value)
+                self.tree.insert('', 'end', iid=str(position), values=values)
+            kept = [iid for iid in selection if self.window_start <= int(iid) < self.window_end]
+            if kept:
+                self.tree.selection_set(kept)
+            if focus and self.window_start <= int(focus) < self.window_end:
+                self.tree.focus(focus)
+
+        # Scroll the materialized window so first_row is at the top
+        window_size = self.window_end - self.window_start
+        if window_size:
+            self.tree.yview_moveto((self.first_row - self.window_start) / window_size)
+        if total:
+            self.y_scrollbar.set(self.first_row / total, last_row / total)
+        else:
+            self.y_scrollbar.set(0, 1)
+
+    def on_table_scroll(self, action, amount, unit=None):
+        """Scrollbar command: move through the full result set"""
+        visible = self.visible_row_count()
+        if action == 'moveto':
+            self.first_row = int(float(amount) * len(self.view_df))
+        elif action == 'scroll':
+            step = visible if unit == 'pages' else 1
+            self.first_row += int(amount) * step
+        self.render_window()
+
+    def on_tree_yview(self, first, last):
+        """Track scrolling done by the tree itself, e.g. keyboard navigation"""
+        window_size = self.window_end - self.window_start
+        if not window_size:
+            return
+        if float(last) - float(first) < 1:
+            self.shown_rows = max(1, round((float(last) - float(first)) * window_size))
+        first_row = self.window_start + round(float(first) * window_size)
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.render_window()
+
+    def on_table_wheel(self, event):
+        """Mouse wheel scrolling over the virtual rows"""
+        if event.num == 4 or event.delta > 0:
+            self.first_row -= 3
+        else:
+            self.first_row += 3
+        self.render_window()
+        return "break"
+
     def update_summary(self):
         """Update the summary information"""
         try:
-            # Calculate total amount
-            total = self.df['Amount'].sum() if not self.df.empty else 0
-            self.total_amount_var.set(f"Total Amount: SAR {total:,.2f}")
+            # Total is cached when the data is loaded
+            self.total_amount_var.set(f"Total Amount: SAR {self.amount_total:,.2f}")
             
             # Update transaction count
             count = len(self.df) if not self.df.empty else 0
@@ -293,26 +726,28 @@ class ClearingTab:
             ascending = False
             
         try:
-            if col == 'Amount':
-                # Convert amount strings to numeric for sorting
-                self.df['Amount'] = self.df['Amount'].apply(
-                    lambda x: float(str(x).replace(',', '')) if pd.notnull(x) else 0.0
-                )
-                self.df = self.df.sort_values(by=col, ascending=ascending)
-                # Convert back to string format
-                self.df['Amount'] = self.df['Amount'].apply(
-                    lambda x: f"{float(x):,.2f}" if pd.notnull(x) else "0.00"
-                )
-            else:
-                self.df = self.df.sort_values(by=col, ascending=ascending, na_position='last')
+            # Amount is numeric since ingest, so every column sorts directly
+            self.df = self.df.sort_values(by=col, ascending=ascending, na_position='last')
                 
             self._last_sort = (col, ascending)
+            
+            # Keep the search text in the new row order
+            if self.search_index is not None:
+                self.search_index = {name: text.loc[self.df.index] for name, text in self.search_index.items()}
+            self.last_search = None
             self.update_table()
         except Exception as e:
             print(f"Sort error: {e}")
             
     def on_search(self, *args):
-        """Handle search input - simple implementation without validation"""
+        """Refilter the table once typing pauses"""
+        if self.search_after_id is not None:
+            self.clearing_frame.after_cancel(self.search_after_id)
+        self.search_after_id = self.clearing_frame.after(self.SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        """Apply the current search"""
+        self.search_after_id = None
         self.update_table()
         
     def load_company_data(self, company):
@@ -325,14 +760,21 @@ class ClearingTab:
                 self.df = pd.DataFrame(data.get('data', []))
             else:
                 self.df = pd.DataFrame()
+            self.df = self.normalize_amounts(self.df)
+            self.build_search_index()
             self.update_table()
         except Exception as e:
             print(f"Error loading company data: {e}")
-            self.df = pd.DataFrame()
+            self.df = self.normalize_amounts(pd.DataFrame())
+            self.build_search_index()
             self.update_table()
             
     def on_company_change(self, event=None):
         """Handle company selection change"""
+        if self.import_thread is not None:
+            # The import belongs to the previous company; drop it
+            self.previous_df = None
+            self.cancel_import()
         self.load_data()
         
     def on_reconcile_change(self, event=None):
@@ -371,23 +813,18 @@ class ClearingTab:
         results_tree.heading("Transactions", text="Transaction Count")
         results_tree.pack(fill=tk.BOTH, expand=True)
         
+        self.ensure_vendor_index()
+        
         def update_suggestions(*args):
             # Clear existing items
             for item in results_tree.get_children():
                 results_tree.delete(item)
                 
-            search_text = vendor_var.get().strip().lower()
-            if not search_text:
-                return
-                
-            # Get matching vendors and their transaction counts
-            vendors = self.df[self.df['Vendor Name'].str.lower().str.contains(
-                search_text, na=False)]
-            vendor_counts = vendors['Vendor Name'].value_counts()
-            
-            # Update results
-            for vendor, count in vendor_counts.items():
-                results_tree.insert('', 'end', values=(vendor, f"{count} transactions"))
+            # Matching vendors come from the index with their counts precomputed
+            vendors = self.ensure_vendor_index()['vendors']
+            for vendor in self.match_vendors(vendor_var.get(), self.VENDOR_SUGGESTIONS):
+                results_tree.insert('', 'end', iid=vendor,
+                                    values=(vendor, f"{vendors[vendor]['count']} transactions"))
                 
         vendor_var.trace('w', update_suggestions)
         
@@ -396,8 +833,8 @@ class ClearingTab:
             if not selection:
                 return
                 
-            vendor = results_tree.item(selection[0])['values'][0]
-            show_vendor_details(vendor, dialog)
+            # The iid keeps the exact name; Tk may turn numeric-looking values into ints
+            self.show_vendor_details(selection[0], dialog)
             
         results_tree.bind('<Double-1>', on_vendor_select)
         
@@ -408,8 +845,14 @@ class ClearingTab:
         dialog.geometry("800x600")
         dialog.transient(parent_dialog)
         
-        # Get vendor transactions
-        vendor_df = self.df[self.df['Vendor Name'] == vendor_name]
+        # Get vendor transactions from the precomputed row labels
+        vendor = self.ensure_vendor_index()['vendors'].get(vendor_name)
+        if vendor is None:
+            vendor_df = self.df.iloc[0:0]
+            total, count = 0.0, 0
+        else:
+            vendor_df = self.df.loc[vendor['rows']]
+            total, count = vendor['total'], vendor['count']
         
         # Create table
         columns = ("Month", "Transaction Number", "Amount", "Notes")
@@ -432,9 +875,6 @@ class ClearingTab:
         tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Summary
-        total = vendor_df['Amount'].sum()
-        count = len(vendor_df)
-        
         summary_frame = ttk.Frame(dialog, padding="10")
         summary_frame.pack(fill=tk.X)
         
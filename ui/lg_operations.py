@@ -1,10 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import pandas as pd
+import os
+import pickle
+import threading
+import queue
 from datetime import datetime, timedelta
 from pathlib import Path
 
 class LGTab:
+    LOAD_POLL_MS = 50  # How often the UI checks for a finished background load
+    CACHE_PROTOCOL = 5  # Pickle protocol of the binary LG cache
+    REQUIRED_COLUMNS = ["Sequence No.", "Vendor Name", "LG Number",
+                        "Start Date", "End Date", "Type of LG"]
+    
     def __init__(self, parent, main_app):
         """Initialize LG tab"""
         self.parent = parent
@@ -20,6 +29,16 @@ class LGTab:
         # Ensure data directory exists
         self.lg_file.parent.mkdir(parents=True, exist_ok=True)
         
+        # Parsed workbook, keyed to the (mtime, size) it was read from
+        self.lg_df = None
+        self.lg_error = None  # Validation message when the workbook was unusable
+        self.lg_signature = False  # False until the first load; None when the file is missing
+        self.displayed_date = None  # Day the Days Remaining column was computed for
+        
+        # Background load state
+        self.load_thread = None
+        self.load_queue = queue.Queue()
+        
     def create_lg_tab(self):
         """Create the LG tab interface"""
         # Top section with Update button
@@ -93,42 +112,128 @@ class LGTab:
         """Update LGs information with proper error handling"""
         try:
             # Check if file exists
-            if not self.lg_file.exists():
+            signature = self.source_signature()
+            if signature is None:
+                self.lg_signature = None
                 messagebox.showerror("Error", "LGs file not found")
                 return
                 
+            if self.load_thread and self.load_thread.is_alive():
+                return
+                
+            if signature == self.lg_signature:
+                # Unchanged workbook: refresh Days Remaining from the cached frame
+                self.show_lgs()
+                return
+                
+            # Parse off the UI thread; poll_load shows the result
+            self.load_thread = threading.Thread(target=self.load_worker, args=(signature,),
+                                                name="lg-load", daemon=True)
+            self.load_thread.start()
+            self.lg_frame.after(self.LOAD_POLL_MS, self.poll_load)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to update LGs: {str(e)}")
+            
+    def cache_path(self):
+        """Binary cache stored next to the LG workbook"""
+        return self.lg_file.with_suffix('.cache')
+        
+    def source_signature(self):
+        """(mtime, size) of the LG workbook, or None if it does not exist"""
+        try:
+            stat = self.lg_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+        
+    def read_cache(self, signature):
+        """Parsed LG frame from the binary cache, or None if it is missing or stale"""
+        cache_file = self.cache_path()
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('source') == signature:
+                return cached['df']
+        except Exception as e:
+            if cache_file.exists():
+                print(f"Ignoring LG cache {cache_file.name}: {e}")
+        return None
+        
+    def write_cache(self, signature, df):
+        """Store the parsed LG frame in the binary cache, keyed to the workbook's mtime and size"""
+        cache_file = self.cache_path()
+        temp_file = cache_file.with_suffix('.cache.tmp')
+        try:
+            with open(temp_file, 'wb') as f:
+                pickle.dump({'source': signature, 'df': df}, f, protocol=self.CACHE_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except Exception as e:
+            print(f"Error writing LG cache: {e}")
+            
+    def parse_workbook(self):
+        """Read the LG workbook and coerce its dates; returns (df, error message)"""
+        df = pd.read_excel(self.lg_file)
+        if df.empty:
+            return df, None
+            
+        # Basic data validation
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
+        if missing_columns:
+            return None, f"Missing columns: {', '.join(missing_columns)}"
+            
+        # Convert dates safely
+        try:
+            df['Start Date'] = pd.to_datetime(df['Start Date'], errors='coerce')
+            df['End Date'] = pd.to_datetime(df['End Date'], errors='coerce')
+        except Exception as e:
+            return None, f"Invalid date format: {str(e)}"
+            
+        # Remove rows with invalid dates
+        return df.dropna(subset=['Start Date', 'End Date']), None
+        
+    def load_worker(self, signature):
+        """Worker thread: parsed frame from the cache, or from the workbook on a miss"""
+        try:
+            df, error = self.read_cache(signature), None
+            if df is None:
+                df, error = self.parse_workbook()
+                if error is None:
+                    self.write_cache(signature, df)
+            self.load_queue.put((signature, df, error))
+        except Exception as e:
+            self.load_queue.put((signature, None, f"Failed to update LGs: {str(e)}"))
+            
+    def poll_load(self):
+        """Show the background load once it finishes (runs on the UI thread)"""
+        try:
+            signature, df, error = self.load_queue.get_nowait()
+        except queue.Empty:
+            self.lg_frame.after(self.LOAD_POLL_MS, self.poll_load)
+            return
+        self.lg_signature, self.lg_df, self.lg_error = signature, df, error
+        self.show_lgs()
+        
+    def show_lgs(self):
+        """Display the cached LG frame with Days Remaining as of now"""
+        try:
+            self.displayed_date = datetime.now().date()
+            
             # Clear existing items
             self.results_tree.delete(*self.results_tree.get_children())
             self.summary_tree.delete(*self.summary_tree.get_children())
             
-            # Read Excel file
-            df = pd.read_excel(self.lg_file)
-            
-            if df.empty:
-                messagebox.showinfo("Info", "No LG data found")
+            if self.lg_error:
+                messagebox.showerror("Error", self.lg_error)
                 return
                 
-            # Basic data validation
-            required_columns = ["Sequence No.", "Vendor Name", "LG Number", 
-                              "Start Date", "End Date", "Type of LG"]
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                messagebox.showerror("Error", f"Missing columns: {', '.join(missing_columns)}")
-                return
-                
-            # Convert dates safely
-            try:
-                df['Start Date'] = pd.to_datetime(df['Start Date'], errors='coerce')
-                df['End Date'] = pd.to_datetime(df['End Date'], errors='coerce')
-            except Exception as e:
-                messagebox.showerror("Error", f"Invalid date format: {str(e)}")
+            if self.lg_df is None or self.lg_df.empty:
+                messagebox.showinfo("Info", "No LG data found")
                 return
                 
-            # Remove rows with invalid dates
-            df = df.dropna(subset=['Start Date', 'End Date'])
-            
             # Calculate days remaining
             today = datetime.now()
+            df = self.lg_df.copy()
             df['Days Remaining'] = (df['End Date'] - today).dt.days
             
             # Update display
@@ -210,5 +315,8 @@ class LGTab:
     
     def check_for_updates(self):
         """Check for updates if needed"""
-        if not self.last_check_time or (datetime.now() - self.last_check_time).total_seconds() > 3600:
-            self.update_lgs()
+        # A stat call is all an unchanged workbook costs; Days Remaining still rolls over daily
+        if self.source_signature() == self.lg_signature and (
+                self.lg_signature is None or self.displayed_date == datetime.now().date()):
+            return
+        self.update_lgs()
@@ -6,16 +6,19 @@ from utils.todo_system import TodoManager, Task, TaskPriority, TaskStatus, UserR
 from pathlib import Path
 
 class TodoTab:
-    def __init__(self, parent, current_user):
+    DEADLINE_CHECK_MS = 60000  # How often deadline alerts are checked
+    SEARCH_DELAY_MS = 300  # Typing pause before a search runs
+    
+    def __init__(self, parent, current_user, main_app=None):
         self.parent = parent
         self.current_user = current_user
-        self.todo_manager = TodoManager()
+        self.main_app = main_app
         
         # Set data file path and ensure directory exists
         self.base_dir = Path(__file__).parent.parent
         self.data_dir = self.base_dir / "data"
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.todo_manager.data_file = self.data_dir / "todo_data.json"
+        self.todo_manager = TodoManager(self.data_dir / "todo_data.json")
         
         # Create main frame with padding
         self.main_frame = ttk.Frame(parent, padding="10")
@@ -42,6 +45,23 @@ class TodoTab:
         new_task_frame.pack(fill=tk.X, padx=5, pady=5)
         ttk.Button(new_task_frame, text="New Task", command=self.start_new_task).pack(side=tk.LEFT, padx=5)
         
+        # Task view filter
+        self.view_var = tk.StringVar(value="All Tasks")
+        view_combo = ttk.Combobox(new_task_frame, textvariable=self.view_var, state='readonly', width=12,
+                                  values=["All Tasks", "My Tasks", "To Review"])
+        view_combo.pack(side=tk.RIGHT, padx=5)
+        ttk.Label(new_task_frame, text="Show:").pack(side=tk.RIGHT)
+        view_combo.bind('<<ComboboxSelected>>', lambda e: self.update_task_list())
+        
+        # Full-text search over descriptions and feedback, including archived tasks
+        search_frame = ttk.Frame(task_frame)
+        search_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=5)
+        self.search_var = tk.StringVar()
+        self.search_after_id = None
+        self.search_var.trace('w', self.on_search)
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
         # Create Treeview with scrollbar
         tree_frame = ttk.Frame(task_frame)
         tree_frame.pack(fill=tk.BOTH, expand=True)
@@ -158,10 +178,23 @@ class TodoTab:
         # Bind tree selection
         self.tree.bind('<<TreeviewSelect>>', self.on_select)
         
+        # Write buffered changes when the tab goes away
+        self.main_frame.bind('<Destroy>', self.on_destroy)
+        
+        # Deadline alert colors, matching the LG tab
+        self.tree.tag_configure('overdue', foreground='red')
+        self.tree.tag_configure('due_soon', foreground='orange')
+        self.tree.tag_configure('archived', foreground='gray')
+        self.todo_manager.register_deadline_callbacks(
+            on_due_soon=lambda task: self.mark_deadline(task, 'due_soon'),
+            on_overdue=lambda task: self.mark_deadline(task, 'overdue'))
+        
         # Initial update
+        self.todo_manager.check_deadlines()
         self.update_task_list()
         self.is_new_task = True
         self.disable_form_editing()
+        self.main_frame.after(self.DEADLINE_CHECK_MS, self.check_deadlines)
 
     def start_new_task(self):
         """Start creating a new task"""
@@ -210,8 +243,7 @@ class TodoTab:
             messagebox.showwarning("Warning", "Please enter feedback")
             return
             
-        task.add_feedback(self.current_user.username, feedback)
-        self.todo_manager.save_tasks()
+        self.todo_manager.add_feedback(task, self.current_user.username, feedback)
         self.update_feedback_history(task)
         self.new_feedback.delete("1.0", tk.END)
         messagebox.showinfo("Success", "Feedback added successfully")
@@ -297,22 +329,69 @@ class TodoTab:
         self.is_new_task = False
         self.update_button_states()
 
+    def on_destroy(self, event):
+        """Flush pending task changes to disk"""
+        if event.widget is self.main_frame:
+            self.todo_manager.close()
+
+    def check_deadlines(self):
+        """Fire due deadline alerts and reschedule the check"""
+        if self.todo_manager.check_deadlines():
+            self.update_deadline_notifications()
+        self.main_frame.after(self.DEADLINE_CHECK_MS, self.check_deadlines)
+
+    def mark_deadline(self, task, tag):
+        """Color a task row that became due soon or overdue"""
+        if self.tree.exists(task.id):
+            self.tree.item(task.id, tags=(tag,))
+
+    def update_deadline_notifications(self):
+        """Report the current user's due-soon and overdue tasks to the main window"""
+        if not self.main_app or not hasattr(self.main_app, 'update_all_notifications'):
+            return
+        username = self.current_user.username
+        alerts = self.todo_manager.get_due_soon_tasks() + self.todo_manager.get_overdue_tasks()
+        count = sum(1 for task in alerts if username in (task.owner, task.reviewer))
+        self.main_app.update_all_notifications(count, source='todo')
+
+    def on_search(self, *args):
+        """Refresh the task list once typing pauses"""
+        if self.search_after_id is not None:
+            self.main_frame.after_cancel(self.search_after_id)
+        self.search_after_id = self.main_frame.after(self.SEARCH_DELAY_MS, self.update_task_list)
+
     def update_task_list(self):
         """Update task list display"""
         # Clear existing items
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        # Add active tasks
-        for i, task in enumerate(self.todo_manager.get_active_tasks()):
-            item_id = f"I{i+1:03d}"  # Generate predictable IDs
-            self.tree.insert('', 'end', iid=item_id, text=task.description, values=(
+        # Add search results, or active tasks for the selected view
+        self.search_after_id = None
+        query = self.search_var.get().strip()
+        view = self.view_var.get()
+        username = self.current_user.username
+        if query:
+            tasks = self.todo_manager.search_tasks(query)
+        elif view == "My Tasks":
+            tasks = self.todo_manager.find_tasks(owner=username)
+        elif view == "To Review":
+            tasks = self.todo_manager.find_tasks(reviewer=username)
+        else:
+            tasks = self.todo_manager.get_active_tasks()
+        
+        for task in tasks:
+            alert = 'archived' if task.archived else self.todo_manager.get_deadline_alert(task.id)
+            self.tree.insert('', 'end', iid=task.id, text=task.description, values=(
                 task.owner,
                 task.reviewer if task.reviewer else "",
                 task.status.value,
                 task.deadline,
                 task.priority.value
-            ))
+            ), tags=(alert,) if alert else ())
+        
+        # Completed or archived tasks may have cleared alerts
+        self.update_deadline_notifications()
 
     def update_button_states(self):
         """Update button states based on selected task and user permissions"""
@@ -345,15 +424,11 @@ class TodoTab:
         if not selected:
             return None
 
-        item = selected[0]
-        description = self.tree.item(item)["text"]
-        owner = self.tree.item(item)["values"][0]
-
-        for task in self.todo_manager.get_active_tasks():
-            if task.description == description and task.owner == owner:
-                return task
-
-        return None
+        # Tree items are keyed by task id
+        task = self.todo_manager.get_task(selected[0])
+        if task is None or task.archived:
+            return None
+        return task
 
     def start_work(self):
         """Start work on selected task"""
@@ -506,29 +581,47 @@ class HistoryWindow(tk.Toplevel):
         self.tree.column('Priority', width=80)
         self.tree.column('Archived Date', width=120)
         
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Add scrollbar; reaching the bottom fetches the next page
+        self.scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
         
         # Pack tree and scrollbar
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Page status
+        self.status_label = ttk.Label(self, text="")
+        self.status_label.pack(pady=(5, 0))
         
         # Add close button
         close_button = ttk.Button(self, text="Close", command=self.destroy)
         close_button.pack(pady=10)
         
-        # Populate tree
+        # Populate tree with the first page
+        self.page = 0
+        self.loaded = 0
+        self.page_pending = False
+        self.total = self.todo_manager.get_archived_count()
         self.populate_tree()
         
         # Make window modal
         self.transient(parent)
         self.grab_set()
         
+    def on_scroll(self, first, last):
+        """Update the scrollbar and load the next page near the bottom"""
+        self.scrollbar.set(first, last)
+        if float(last) >= 0.95 and self.loaded < self.total and not self.page_pending:
+            self.page_pending = True
+            self.after_idle(self.populate_tree)
+
     def populate_tree(self):
-        """Populate tree with archived tasks"""
-        for task in self.todo_manager.get_archived_tasks():
-            self.tree.insert("", tk.END, text=task.description, values=(
+        """Append the next page of archived tasks to the tree"""
+        self.page_pending = False
+        if self.loaded >= self.total:
+            return
+        for task in self.todo_manager.get_archived_page(self.page):
+            self.tree.insert("", tk.END, iid=task.id, text=task.description, values=(
                 task.owner,
                 task.reviewer if task.reviewer else "",
                 task.status.value,
@@ -536,3 +629,6 @@ class HistoryWindow(tk.Toplevel):
                 task.priority.value,
                 task.archived_date
             ))
+            self.loaded += 1
+        self.page += 1
+        self.status_label.configure(text=f"Showing {self.loaded} of {self.total} archived tasks")
@@ -4,6 +4,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import tkinter as tk
 from tkinter import ttk
+import pandas as pd
 from ui.bank_accounts_tab import BankAccountsTab
 from ui.clearing_tab import ClearingTab
 from ui.folder_tab import FolderTab
@@ -77,9 +78,54 @@ class UIEventTests:
         except Exception as e:
             print(f"Clearing Tab Events Failed: {str(e)}")
     
+    def test_clearing_table_navigation(self):
+        """Test keyboard navigation across re-windows of the virtual clearing table"""
+        print("\nTest Case 3: Clearing Table Navigation")
+        try:
+            # The tree needs a real height to compute its visible rows
+            self.notebook.pack(fill=tk.BOTH, expand=True)
+            self.root.deiconify()
+            self.root.geometry("800x600")
+            self.root.update()
+            
+            rows = 1000
+            self.clearing_tab.df = self.clearing_tab.normalize_amounts(pd.DataFrame({
+                'Month': 'Jan', 'Transaction Number': [str(i) for i in range(rows)],
+                'Vendor Name': 'Test Vendor', 'Amount': 1.0, 'Notes': '', 'Comments': ''
+            }))
+            self.clearing_tab.build_search_index()
+            self.clearing_tab.search_var.set("")
+            self.clearing_tab.update_table()
+            
+            tree = self.clearing_tab.tree
+            tree.focus_set()
+            tree.focus('0')
+            tree.selection_set('0')
+            self.root.update()
+            
+            # Each Down scrolls the tree, which feeds yscrollcommand back into render_window
+            for _ in range(rows - 1):
+                tree.event_generate('<Down>')
+                self.root.update()
+            # bbox is empty unless the row is actually scrolled into view
+            reached_end = (tree.focus() == str(rows - 1) and tree.selection() == (str(rows - 1),)
+                           and bool(tree.bbox(str(rows - 1))))
+            
+            for _ in range(rows - 1):
+                tree.event_generate('<Up>')
+                self.root.update()
+            reached_start = tree.focus() == '0' and self.clearing_tab.first_row == 0
+            
+            print(f"Keyboard Navigation: {'PASS' if reached_end and reached_start else 'FAIL'}")
+            print(f"Focus: {tree.focus()}, window {self.clearing_tab.window_start}-{self.clearing_tab.window_end}")
+        except Exception as e:
+            print(f"Clearing Table Navigation Failed: {str(e)}")
+        finally:
+            self.root.withdraw()
+    
     def test_folder_tab_events(self):
         """Test folder tab UI events"""
-        print("\nTest Case 3: Folder Tab Events")
+        print("\nTest Case 4: Folder Tab Events")
         try:
             # Test company selection
             self.folder_tab.company_var.set(Company.MVNO.value)
@@ -99,6 +145,7 @@ class UIEventTests:
             print("Starting UI Event Tests...")
             self.test_bank_tab_events()
             self.test_clearing_tab_events()
+            self.test_clearing_table_navigation()
             self.test_folder_tab_events()
             print("\nAll UI Event Tests Complete!")
         except Exception as e:
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class IdempotencyKeyReuseError(ValueError):
+    """An idempotency key was presented again with different request data"""
+    pass
+
+
+def payload_fingerprint(payload):
+    """Stable hash of a request payload, stored with its idempotency key"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class IdempotencyCache:
+    """Bounded, TTL-evicted map of idempotency key -> first result.
+
+    Completed results are appended to a JSON-lines journal so they survive
+    restarts inside their TTL window; the journal is compacted on load and
+    whenever it grows well past the live entries. A key being processed is
+    claimed, so a concurrent retry waits for the first outcome instead of
+    running the payment again. Each entry keeps the fingerprint of the
+    payload it was claimed with, so a key reused for different data is
+    rejected instead of replaying an unrelated result.
+    """
+
+    def __init__(self, journal_file, ttl_seconds=24 * 3600, max_entries=100000):
+        self.journal_file = Path(journal_file)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (expires_at, result, fingerprint), oldest first
+        self.in_flight = {}  # key -> (Future of the first attempt, fingerprint)
+        self.journal_lines = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Read live entries from the journal and rewrite it without the dead ones"""
+        now = time.time()
+        if self.journal_file.exists():
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        key, expires_at, result = entry['key'], entry['expires_at'], entry['result']
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Torn final line from a crash
+                    if expires_at > now:
+                        self.entries.pop(key, None)
+                        # Entries journaled before fingerprints were kept have none
+                        self.entries[key] = (expires_at, result, entry.get('fingerprint'))
+        self._evict(now)
+        self._compact()
+
+    def _evict(self, now):
+        """Drop expired entries and trim to max_entries (caller holds the lock)"""
+        # Entries are in insertion order and share one TTL, so expiry is FIFO
+        while self.entries:
+            key, (expires_at, _, _) = next(iter(self.entries.items()))
+            if expires_at > now and len(self.entries) <= self.max_entries:
+                break
+            del self.entries[key]
+
+    def _compact(self):
+        """Atomically rewrite the journal with only the live entries"""
+        temp_file = self.journal_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            for key, (expires_at, result, fingerprint) in self.entries.items():
+                f.write(self._encode(key, expires_at, result, fingerprint))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.journal_file)
+        self.journal_lines = len(self.entries)
+
+    def _encode(self, key, expires_at, result, fingerprint=None):
+        return json.dumps({'key': key, 'expires_at': expires_at, 'result': result,
+                           'fingerprint': fingerprint},
+                          separators=(',', ':'), default=str) + '\n'
+
+    def _check_fingerprint(self, key, stored, fingerprint):
+        """Raise if a key comes back with a payload other than the one it was claimed with"""
+        if stored is not None and fingerprint is not None and stored != fingerprint:
+            raise IdempotencyKeyReuseError(
+                f"Idempotency key {key} was already used with different payment data")
+
+    def claim(self, key, fingerprint=None):
+        """Look up a key before processing.
+
+        Returns ``(result, None)`` for a cached outcome, ``(None, future)``
+        when another attempt is in flight, and ``(None, None)`` when the
+        caller now owns the key and must call ``complete``. Raises
+        IdempotencyKeyReuseError when ``fingerprint`` differs from the one
+        the key was first claimed with.
+        """
+        with self.lock:
+            now = time.time()
+            self._evict(now)
+            if key in self.entries and self.entries[key][0] > now:
+                _, result, stored = self.entries[key]
+                self._check_fingerprint(key, stored, fingerprint)
+                return result, None
+            if key in self.in_flight:
+                future, stored = self.in_flight[key]
+                self._check_fingerprint(key, stored, fingerprint)
+                return None, future
+            self.in_flight[key] = (Future(), fingerprint)
+            return None, None
+
+    def complete(self, key, result, cache=True):
+        """Record the owner's outcome and release anyone waiting on it"""
+        with self.lock:
+            future, fingerprint = self.in_flight.pop(key, (None, None))
+            if cache:
+                expires_at = time.time() + self.ttl_seconds
+                self.entries.pop(key, None)
+                self.entries[key] = (expires_at, result, fingerprint)
+                self._evict(time.time())
+                try:
+                    with open(self.journal_file, 'a', encoding='utf-8') as f:
+                        f.write(self._encode(key, expires_at, result, fingerprint))
+                    self.journal_lines += 1
+                    if self.journal_lines > 2 * max(len(self.entries), 1000):
+                        self._compact()
+                except OSError:
+                    pass  # The in-memory entry still serves retries until restart
+        if future is not None:
+            future.set_result(result)
+
+    def remember(self, key, result, created_at, fingerprint=None):
+        """Seed an entry recovered from elsewhere if it is still inside its TTL"""
+        expires_at = created_at + self.ttl_seconds
+        with self.lock:
+            if key not in self.entries and expires_at > time.time():
+                self.entries[key] = (expires_at, result, fingerprint)
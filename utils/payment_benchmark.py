@@ -0,0 +1,281 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import string
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from utils.payment_processor import PaymentProcessor
+
+VALID_IBAN = 'SA0380000000608010167519'
+INVALID_KINDS = ('company', 'reference', 'amount', 'date', 'iban_checksum',
+                 'beneficiary', 'cnp_approval', 'duplicate')
+
+
+def make_reference(index, year=None):
+    """Unique XXX-YYYY-NNNN reference for a sequence number"""
+    year = year or datetime.now().year
+    prefix_index, sequence = divmod(index, 10000)
+    letters = ''
+    for _ in range(3):
+        prefix_index, digit = divmod(prefix_index, 26)
+        letters = string.ascii_uppercase[digit] + letters
+    return f"{letters}-{year}-{sequence:04d}"
+
+
+def make_payment(index):
+    """Valid payment dict accepted by ValidationSystem.validate_input"""
+    return {
+        'company': 'SALAM',
+        'reference': make_reference(index),
+        'amount': '1250.00',
+        'date': datetime.now(),
+        'beneficiary': {'name': 'Benchmark Vendor', 'account': VALID_IBAN, 'bank': 'SNB'},
+        'cnp_approval': True
+    }
+
+
+def make_iban(index):
+    """Valid SA IBAN with correct mod-97 check digits for an account number"""
+    bban = f"80{index:018d}"
+    check = 98 - int(bban + '2810' + '00') % 97
+    return f"SA{check:02d}{bban}"
+
+
+def make_invalid_payment(index, kind):
+    """Payment dict that fails validation in one specific way"""
+    payment = make_payment(index)
+    if kind == 'company':
+        payment['company'] = 'ACME'
+    elif kind == 'reference':
+        payment['reference'] = f"INV{index}"
+    elif kind == 'amount':
+        payment['amount'] = '-10.00'
+    elif kind == 'date':
+        payment['date'] = datetime.now() + timedelta(days=30)
+    elif kind == 'iban_checksum':
+        iban = make_iban(index)
+        payment['beneficiary']['account'] = iban[:-1] + str((int(iban[-1]) + 1) % 10)
+    elif kind == 'beneficiary':
+        payment['beneficiary'] = {'name': 'X', 'account': VALID_IBAN, 'bank': 'SNB'}
+    elif kind == 'cnp_approval':
+        payment['cnp_approval'] = False
+    elif kind == 'duplicate':
+        payment['reference'] = make_reference(0)
+    return payment
+
+
+def generate_payments(count, invalid_ratio=0.1, beneficiaries=2000, seed=42):
+    """Synthetic load: valid payments over a pool of beneficiaries plus invalid ones"""
+    rng = random.Random(seed)
+    payments = []
+    for i in range(count):
+        if i and rng.random() < invalid_ratio:
+            payments.append(make_invalid_payment(i, rng.choice(INVALID_KINDS)))
+        else:
+            payment = make_payment(i)
+            payment['beneficiary']['account'] = make_iban(rng.randrange(beneficiaries))
+            payments.append(payment)
+    return payments
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_load(payments, concurrency=4, files_dir=None):
+    """Drive process_payment at the given concurrency and summarize the run"""
+    latencies = []
+    outcomes = Counter()
+    errors = Counter()
+    lock = threading.Lock()
+
+    with tempfile.TemporaryDirectory(dir=files_dir) as run_dir:
+        processor = PaymentProcessor(run_dir)
+        processor.validation_system.validator.reset_stats()
+
+        def call(payment):
+            start = time.perf_counter()
+            result = processor.process_payment(payment)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                outcomes[result['error_type'] or 'success'] += 1
+                if result['error']:
+                    errors[result['error']] += 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(call, payments))
+        wall_time = time.perf_counter() - start
+        rule_stats = processor.validation_system.get_rule_stats()
+        processor.close()
+
+    latencies.sort()
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'payments': len(payments),
+        'concurrency': concurrency,
+        'wall_seconds': wall_time,
+        'throughput_per_second': len(payments) / wall_time if wall_time else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 50) * 1000,
+            'p95': percentile(latencies, 95) * 1000,
+            'p99': percentile(latencies, 99) * 1000,
+            'max': latencies[-1] * 1000 if latencies else 0.0
+        },
+        'outcomes': dict(outcomes),
+        'errors': dict(errors.most_common(20)),
+        'validation_rules': rule_stats
+    }
+
+
+def compare_runs(baseline, current):
+    """Print throughput and latency deltas against a saved run"""
+    print("\nComparison with baseline:")
+    rows = [('throughput/s', baseline['throughput_per_second'], current['throughput_per_second'])]
+    rows += [(f"{name} ms", baseline['latency_ms'][name], current['latency_ms'][name])
+             for name in ('p50', 'p95', 'p99')]
+    for name, before, after in rows:
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{name:>14} {before:>12,.3f} -> {after:>12,.3f} ({change:+.1f}%)")
+
+
+def prefill(processor, count):
+    """Load the in-memory state as if `count` payments were already processed"""
+    with processor.lock:
+        for i in range(len(processor.payments), count):
+            payment_id = f"prefill-{i}"
+            reference = make_reference(i)
+            processor.payments[payment_id] = {'reference': reference, 'status': 'completed'}
+            processor.references[reference] = payment_id
+
+
+def bench_duplicate_check(sizes, batch=1000):
+    """Throughput of process_payment as the number of known payments grows"""
+    print("\nBenchmark: process_payment throughput vs. existing payments")
+    print(f"{'existing':>10} {'payments/s':>12} {'duplicate checks/s':>20}")
+    with tempfile.TemporaryDirectory() as files_dir:
+        processor = PaymentProcessor(files_dir)
+        next_index = max(sizes) + 1
+        for size in sorted(sizes):
+            prefill(processor, size)
+
+            start = time.perf_counter()
+            for i in range(batch):
+                result = processor.process_payment(make_payment(next_index + i))
+                if not result['success']:
+                    raise RuntimeError(result['error'])
+            elapsed = time.perf_counter() - start
+            next_index += batch
+
+            # Resubmitting known references only exercises the duplicate check
+            start = time.perf_counter()
+            for i in range(batch):
+                processor.process_payment(make_payment(i))
+            dup_elapsed = time.perf_counter() - start
+
+            print(f"{size:>10,} {batch / elapsed:>12,.0f} {batch / dup_elapsed:>20,.0f}")
+
+
+def bench_concurrency(thread_counts, per_thread=500, files_dir=None):
+    """Throughput of concurrent submitters sharing one processor"""
+    print("\nBenchmark: concurrent process_payment scaling")
+    print(f"{'threads':>8} {'payments/s':>12} {'speedup':>8}")
+    baseline = None
+    next_index = 0
+    for threads in thread_counts:
+        with tempfile.TemporaryDirectory(dir=files_dir) as run_dir:
+            processor = PaymentProcessor(run_dir)
+            failures = []
+
+            def submit(start):
+                for i in range(start, start + per_thread):
+                    result = processor.process_payment(make_payment(i))
+                    if not result['success']:
+                        failures.append(result['error'])
+
+            workers = [threading.Thread(target=submit, args=(next_index + t * per_thread,))
+                       for t in range(threads)]
+            next_index += threads * per_thread
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            processor.close()
+
+        if failures:
+            raise RuntimeError(failures[0])
+        throughput = threads * per_thread / elapsed
+        baseline = baseline or throughput
+        print(f"{threads:>8} {throughput:>12,.0f} {throughput / baseline:>7.2f}x")
+
+
+def bench_recovery(count, files_dir=None):
+    """Cold-start time of a processor over `count` persisted payments"""
+    print(f"\nBenchmark: crash recovery of {count:,} payments")
+    with tempfile.TemporaryDirectory(dir=files_dir) as run_dir:
+        processor = PaymentProcessor(run_dir)
+        processor.store.sync = False  # Only the reload is being measured
+        for i in range(count):
+            processor.process_payment(make_payment(i))
+        processor.close()
+
+        start = time.perf_counter()
+        processor = PaymentProcessor(run_dir)
+        elapsed = time.perf_counter() - start
+        stats = processor.recovery_stats
+        processor.close()
+    print(f"Recovered {stats['payments']:,} payments from {stats['segments']} segments "
+          f"in {elapsed:.2f}s (load phase {stats['seconds']:.2f}s)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="PaymentProcessor benchmarks")
+    parser.add_argument('suite', nargs='?', choices=['scaling', 'load'], default='scaling',
+                        help="scaling: lock/index/recovery runs; load: synthetic load with latency report")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--recovery', type=int, default=100000,
+                        help="Number of persisted payments for the cold-start run")
+    parser.add_argument('--count', type=int, default=10000, help="Payments in the load run")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--invalid-ratio', type=float, default=0.1)
+    parser.add_argument('--beneficiaries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write the load report as JSON to this file")
+    parser.add_argument('--baseline', help="Compare the load report with a saved JSON report")
+    parser.add_argument('--files-dir', default=None,
+                        help="Directory on the disk to measure (defaults to the system temp dir)")
+    args = parser.parse_args()
+
+    print("Starting Payment Benchmarks...")
+    if args.suite == 'load':
+        payments = generate_payments(args.count, args.invalid_ratio, args.beneficiaries, args.seed)
+        report = run_load(payments, args.concurrency, args.files_dir)
+        print(json.dumps({k: v for k, v in report.items() if k != 'validation_rules'}, indent=4))
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=4)
+        if args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                compare_runs(json.load(f), report)
+    else:
+        bench_duplicate_check(args.sizes, args.batch)
+        bench_concurrency(args.threads, args.batch, args.files_dir)
+        bench_recovery(args.recovery, args.files_dir)
+    print("\nBenchmark Complete!")
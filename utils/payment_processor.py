@@ -3,10 +3,15 @@ import json
 from datetime import datetime
 import uuid
 import threading
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from decimal import Decimal
 import re
 import html
-from validation_system import ValidationSystem
+from core.validation_system import ValidationSystem
+from utils.segment_store import SegmentStore
+from utils.idempotency import IdempotencyCache, IdempotencyKeyReuseError, payload_fingerprint
 
 class PaymentError(Exception):
     """Base class for payment processing errors"""
@@ -20,27 +25,91 @@ class FileSystemError(PaymentError):
     """File system related errors"""
     pass
 
+class QueueFullError(PaymentError):
+    """Submission queue is at capacity"""
+    pass
+
+class PaymentTicket:
+    """Handle for a payment submitted with PaymentProcessor.submit"""
+    
+    def __init__(self, payment_data, idempotency_key=None):
+        self.ticket_id = str(uuid.uuid4())
+        self.payment_data = payment_data
+        self.idempotency_key = idempotency_key
+        self.future = Future()
+        self.state = 'queued'  # queued -> processing -> done
+        
+    def done(self):
+        """Whether the payment has been processed"""
+        return self.future.done()
+        
+    def result(self, timeout=None):
+        """Wait for and return the process_payment result dict"""
+        return self.future.result(timeout)
+
 class PaymentProcessor:
     """Non-GUI version of payment system for testing"""
     
-    def __init__(self, files_dir):
+    def __init__(self, files_dir, max_segment_bytes=64 * 1024 * 1024,
+                 workers=4, queue_size=1000, recovery_workers=8,
+                 idempotency_ttl=24 * 3600, idempotency_max_entries=100000):
         """Initialize payment processor"""
         self.files_dir = Path(files_dir)
         self.payments = {}
+        self.references = {}  # reference -> payment_id, guarded by self.lock
         self.lock = threading.Lock()
         self.validation_system = ValidationSystem()
-        self.temp_files = set()  # Track temporary files
+        
+        # Asynchronous submission pipeline, workers start on first submit()
+        self.worker_count = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.workers = []
+        self.workers_lock = threading.Lock()
         
         try:
             self.files_dir.mkdir(parents=True, exist_ok=True)
+            self.store = SegmentStore(self.files_dir, max_segment_bytes)
+            self.idempotency_cache = IdempotencyCache(
+                self.files_dir / 'idempotency.jsonl', idempotency_ttl, idempotency_max_entries)
         except OSError as e:
             raise FileSystemError(f"Failed to create files directory: {e}")
+            
+        self.recovery_stats = self._recover(recovery_workers)
+
+    def process_payment(self, payment_data, idempotency_key=None):
+        """Process a payment request with proper error handling.
+        
+        A retry carrying the same ``idempotency_key`` gets the first outcome
+        back (marked ``replayed``) without validating or writing again. A
+        key reused with different payment data is rejected.
+        """
+        if idempotency_key is None:
+            return self._process_payment(payment_data)
+            
+        fingerprint = payload_fingerprint(payment_data)
+        try:
+            cached, in_flight = self.idempotency_cache.claim(idempotency_key, fingerprint)
+        except IdempotencyKeyReuseError as e:
+            return {'success': False, 'error': str(e), 'error_type': 'validation'}
+        if in_flight is not None:
+            cached = in_flight.result()
+        if cached is not None:
+            return {**cached, 'replayed': True}
+            
+        result = {'success': False, 'error': 'Payment processing interrupted', 'error_type': 'general'}
+        try:
+            result = self._process_payment(payment_data, idempotency_key, fingerprint)
+        finally:
+            # Disk and unexpected errors may be transient, so retries run again
+            self.idempotency_cache.complete(
+                idempotency_key, result,
+                cache=result['error_type'] not in ('filesystem', 'general'))
+        return result
 
-    def process_payment(self, payment_data):
-        """Process a payment request with proper error handling"""
+    def _process_payment(self, payment_data, idempotency_key=None, fingerprint=None):
+        """Validate, reserve and persist a single payment"""
         result = {'success': False, 'error': None, 'error_type': None}
         payment_id = None
-        temp_file = None
         
         try:
             # Validate payment data
@@ -57,43 +126,40 @@ class PaymentProcessor:
 
             # Generate payment ID
             payment_id = str(uuid.uuid4())
+            reference = payment_data['reference']
+            
+            payment_record = {
+                'payment_id': payment_id,
+                'timestamp': datetime.now().isoformat(),
+                'status': 'pending',
+                **payment_data
+            }
+            if idempotency_key is not None:
+                payment_record['idempotency_key'] = idempotency_key
+                payment_record['idempotency_fingerprint'] = fingerprint
             
+            # Reserve the reference and register the pending payment
             with self.lock:
-                try:
-                    # Check for duplicate reference
-                    reference = payment_data['reference']
-                    if any(p['reference'] == reference for p in self.payments.values()):
-                        raise ValidationError("Duplicate payment reference")
-
-                    # Create payment record
-                    payment_record = {
-                        'payment_id': payment_id,
-                        'timestamp': datetime.now().isoformat(),
-                        'status': 'pending',
-                        **payment_data
-                    }
-
-                    # Generate temporary file first
-                    temp_file = self._generate_temp_file(payment_record)
-                    self.temp_files.add(temp_file)
-
-                    # Save payment record
-                    self.payments[payment_id] = payment_record
-
-                    # Move temporary file to final location
-                    final_file = self._finalize_payment_file(temp_file, payment_id)
-                    
-                    # Update status
-                    payment_record['status'] = 'completed'
-                    self.payments[payment_id] = payment_record
+                if reference in self.references:
+                    raise ValidationError("Duplicate payment reference")
+                self.payments[payment_id] = payment_record
+                self.references[reference] = payment_id
+
+            # Durable write happens outside the lock; commit or roll back after
+            try:
+                self._persist_payment({**payment_record, 'status': 'completed'})
+            except Exception as e:
+                with self.lock:
+                    self._forget_payment(payment_id, reference)
+                if isinstance(e, FileSystemError):
+                    raise
+                raise PaymentError(f"Payment processing error: {str(e)}")
 
-                    result['success'] = True
-                    result['payment_id'] = payment_id
+            with self.lock:
+                payment_record['status'] = 'completed'
 
-                except OSError as e:
-                    raise FileSystemError(f"File system error: {str(e)}")
-                except Exception as e:
-                    raise PaymentError(f"Payment processing error: {str(e)}")
+            result['success'] = True
+            result['payment_id'] = payment_id
 
         except ValidationError as e:
             result['error'] = str(e)
@@ -104,39 +170,162 @@ class PaymentProcessor:
         except Exception as e:
             result['error'] = str(e)
             result['error_type'] = 'general'
-        finally:
-            # Clean up temporary file if it exists
-            if temp_file and temp_file in self.temp_files:
-                try:
-                    if Path(temp_file).exists():
-                        Path(temp_file).unlink()
-                    self.temp_files.remove(temp_file)
-                except:
-                    pass  # Ignore cleanup errors
                     
         return result
 
-    def _generate_temp_file(self, payment_record):
-        """Generate a temporary file for the payment"""
-        temp_file = self.files_dir / f"temp_{uuid.uuid4()}.json"
+    def _recover(self, max_workers):
+        """Rebuild in-memory state from disk after a restart.
+        
+        Orphaned temp_*.json files from interrupted writes are removed, then
+        legacy payment_*.json files and segment files are loaded in parallel
+        and the reference index is rebuilt.
+        """
+        start = time.perf_counter()
+        orphans_removed = 0
+        for temp_file in self.files_dir.glob("temp_*.json"):
+            try:
+                temp_file.unlink()
+                orphans_removed += 1
+            except OSError:
+                pass
+                
+        legacy_files = list(self.files_dir.glob("payment_*.json"))
+        segments = self.store.list_segments()
+        errors = []
         
+        def load_legacy(paths):
+            records = []
+            for path in paths:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        record = json.load(f)
+                    # A payment file only exists once it was finalized
+                    record['status'] = 'completed'
+                    records.append(record)
+                except (OSError, ValueError) as e:
+                    errors.append(f"{path.name}: {e}")
+            return records
+            
+        chunk_size = max(1, len(legacy_files) // (max_workers * 4) + 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            batches = [executor.submit(self.store.read_segment, number, errors) for number in segments]
+            batches += [executor.submit(load_legacy, legacy_files[i:i + chunk_size])
+                        for i in range(0, len(legacy_files), chunk_size)]
+            for batch in batches:
+                try:
+                    records = batch.result()
+                except (OSError, ValueError) as e:
+                    errors.append(str(e))
+                    continue
+                for record in records:
+                    self.payments[record['payment_id']] = record
+                    self.references[record['reference']] = record['payment_id']
+                    if record.get('idempotency_key'):
+                        self._remember_idempotent_result(record)
+                    
+        return {
+            'payments': len(self.payments),
+            'segments': len(segments),
+            'legacy_files': len(legacy_files),
+            'orphans_removed': orphans_removed,
+            'errors': errors,
+            'seconds': time.perf_counter() - start
+        }
+
+    def _remember_idempotent_result(self, record):
+        """Seed the idempotency cache from a persisted payment whose journal entry may be lost"""
         try:
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(payment_record, f, indent=4)
-            return temp_file
-        except Exception as e:
-            raise FileSystemError(f"Failed to create temporary file: {e}")
+            created_at = datetime.fromisoformat(record['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return
+        self.idempotency_cache.remember(record['idempotency_key'], {
+            'success': True,
+            'error': None,
+            'error_type': None,
+            'payment_id': record['payment_id']
+        }, created_at, record.get('idempotency_fingerprint'))
 
-    def _finalize_payment_file(self, temp_file, payment_id):
-        """Move temporary file to final location"""
-        final_file = self.files_dir / f"payment_{payment_id}.json"
-        
+    def _forget_payment(self, payment_id, reference):
+        """Drop a failed payment so its reference can be retried (caller holds the lock)"""
+        if self.references.get(reference) == payment_id:
+            del self.references[reference]
+        self.payments.pop(payment_id, None)
+
+    def _persist_payment(self, payment_record):
+        """Append the payment record to the segment store"""
         try:
-            Path(temp_file).rename(final_file)
-            return final_file
-        except Exception as e:
-            raise FileSystemError(f"Failed to finalize payment file: {e}")
+            self.store.append(payment_record)
+        except (OSError, TypeError, ValueError) as e:
+            raise FileSystemError(f"Failed to persist payment: {e}")
 
     def get_payment_status(self, payment_id):
         """Get the status of a payment"""
         return self.payments.get(payment_id, {}).get('status', 'unknown')
+
+    def submit(self, payment_data, block=True, timeout=None, idempotency_key=None):
+        """Queue a payment for background processing and return its ticket.
+        
+        Blocks while the queue is full (up to ``timeout`` seconds); raises
+        QueueFullError when it stays full or ``block`` is False.
+        """
+        self._start_workers()
+        ticket = PaymentTicket(payment_data, idempotency_key)
+        try:
+            self.queue.put(ticket, block=block, timeout=timeout)
+        except queue.Full:
+            raise QueueFullError("Payment queue is full, retry later")
+        return ticket
+
+    def get_ticket_status(self, ticket):
+        """Poll a submitted payment: queued, processing, failed or its payment status"""
+        if not ticket.done():
+            return ticket.state
+        result = ticket.result()
+        if not result['success']:
+            return 'failed'
+        return self.get_payment_status(result['payment_id'])
+
+    def _start_workers(self):
+        """Start the worker pool once"""
+        with self.workers_lock:
+            if self.workers:
+                return
+            for i in range(self.worker_count):
+                worker = threading.Thread(target=self._worker_loop,
+                                          name=f"payment-worker-{i}", daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def _worker_loop(self):
+        """Process queued tickets until a shutdown sentinel arrives"""
+        while True:
+            ticket = self.queue.get()
+            try:
+                if ticket is None:
+                    return
+                if not ticket.future.set_running_or_notify_cancel():
+                    continue
+                ticket.state = 'processing'
+                try:
+                    ticket.future.set_result(self.process_payment(ticket.payment_data,
+                                                              ticket.idempotency_key))
+                except Exception as e:
+                    ticket.future.set_exception(e)
+                ticket.state = 'done'
+            finally:
+                self.queue.task_done()
+
+    def shutdown(self, wait=True):
+        """Stop the worker pool after the queued payments are processed"""
+        with self.workers_lock:
+            workers, self.workers = self.workers, []
+        for _ in workers:
+            self.queue.put(None)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def close(self):
+        """Drain the worker pool and release the active segment file"""
+        self.shutdown()
+        self.store.close()
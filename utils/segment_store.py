@@ -0,0 +1,210 @@
+from pathlib import Path
+import json
+import os
+import re
+import threading
+
+# encode() writes payment_id first, so scans can skip full JSON parsing
+RECORD_ID_PATTERN = re.compile(rb'^\{"payment_id":"([^"\\]+)"')
+
+
+class SegmentStore:
+    """Append-only, line-delimited JSON segments with a per-segment index.
+
+    Records are appended to the active ``segment_<n>.jsonl`` file and synced
+    before ``append`` returns. Concurrent appends share fsyncs (group
+    commit): whoever syncs first covers every line written before it. When the active segment reaches
+    ``max_segment_bytes`` it is sealed: its ``segment_<n>.idx`` (id -> offset,
+    length) is written to a temp file and renamed into place, then a new
+    segment is started. A torn final line left by a crash is truncated when
+    the segment is reopened.
+    """
+
+    def __init__(self, directory, max_segment_bytes=64 * 1024 * 1024, sync=True):
+        self.directory = Path(directory)
+        self.max_segment_bytes = max_segment_bytes
+        self.sync = sync
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.written_seq = 0
+        self.synced_seq = 0
+        self.index = {}  # record id -> (segment number, offset, length)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        segments = self.list_segments()
+        self.segment_number = segments[-1] if segments else 1
+        if segments and self._index_path(self.segment_number).exists():
+            # Crashed after sealing but before the next segment was created
+            self.segment_number += 1
+        # Sealed indexes are only read when get() first needs them
+        self.unloaded_segments = [n for n in segments if n != self.segment_number]
+        for number in self.unloaded_segments:
+            if not self._index_path(number).exists():
+                self._seal(number, self._scan_segment(number))
+        self.active_index = self._scan_segment(self.segment_number)
+        self.active_file = open(self._segment_path(self.segment_number), 'ab')
+        self.active_size = self.active_file.tell()
+
+    def _segment_path(self, number):
+        return self.directory / f"segment_{number:06d}.jsonl"
+
+    def _index_path(self, number):
+        return self.directory / f"segment_{number:06d}.idx"
+
+    def list_segments(self):
+        """Segment numbers present on disk, oldest first"""
+        return sorted(int(path.stem.split('_')[1])
+                      for path in self.directory.glob("segment_*.jsonl"))
+
+    def _scan_segment(self, number):
+        """Build a segment's index from its lines, truncating a torn tail"""
+        path = self._segment_path(number)
+        index = {}
+        if not path.exists():
+            return index
+        offset = 0
+        with open(path, 'rb') as f:
+            lines = f.read().split(b'\n')
+        # Only the last line can be torn; everything before it ended in a newline
+        complete = lines[:-1]
+        for position, line in enumerate(complete):
+            match = RECORD_ID_PATTERN.match(line)
+            try:
+                if match and position < len(complete) - 1:
+                    record_id = match.group(1).decode('utf-8')
+                else:
+                    record_id = json.loads(line)['payment_id']
+            except (ValueError, KeyError, TypeError) as e:
+                if position == len(complete) - 1:
+                    break
+                # A corrupt line in the middle is skipped, not truncated with the rest
+                print(f"Skipping corrupt record in {path.name} line {position + 1}: {e}")
+                offset += len(line) + 1
+                continue
+            index[record_id] = (offset, len(line) + 1)
+            offset += len(line) + 1
+        if offset != path.stat().st_size:
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+        return index
+
+    def _seal(self, number, index):
+        """Atomically write a segment's index file"""
+        temp_path = self._index_path(number).with_suffix('.idx.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._index_path(number))
+
+    def _rotate(self):
+        """Seal the active segment and start the next one"""
+        # Lines still waiting for a group sync must be durable before the switch
+        os.fsync(self.active_file.fileno())
+        self.active_file.close()
+        self._seal(self.segment_number, self.active_index)
+        for record_id, (offset, length) in self.active_index.items():
+            self.index[record_id] = (self.segment_number, offset, length)
+        self.segment_number += 1
+        self.active_index = {}
+        self.active_file = open(self._segment_path(self.segment_number), 'ab')
+        self.active_size = 0
+
+    def encode(self, record):
+        """Serialize a record to one segment line"""
+        return json.dumps(record, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+
+    def append(self, record):
+        """Durably append a record keyed by its ``payment_id``"""
+        line = self.encode(record)
+        with self.lock:
+            if self.active_size and self.active_size + len(line) > self.max_segment_bytes:
+                self._rotate()
+            try:
+                self.active_file.write(line)
+                self.active_file.flush()
+            except OSError:
+                # Drop a partially written line so the segment stays parseable
+                self.active_file.truncate(self.active_size)
+                raise
+            self.active_index[record['payment_id']] = (self.active_size, len(line))
+            self.active_size += len(line)
+            self.written_seq += 1
+            seq = self.written_seq
+        if self.sync:
+            self._sync_to(seq)
+
+    def _sync_to(self, seq):
+        """Make every line up to ``seq`` durable, sharing the fsync with other writers"""
+        with self.sync_lock:
+            if self.synced_seq >= seq:
+                return
+            with self.lock:
+                target = self.written_seq
+                fd = os.dup(self.active_file.fileno())
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.synced_seq = target
+
+    def read_segment(self, number, errors=None):
+        """All complete records of one segment, in append order.
+
+        Corrupt lines are skipped and described in ``errors`` (or printed)
+        so the rest of the segment is still returned.
+        """
+        path = self._segment_path(number)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data:
+            return []
+        try:
+            # Parse the whole segment as one JSON array rather than line by line
+            return json.loads(b'[' + data.rstrip(b'\n').replace(b'\n', b',') + b']')
+        except ValueError:
+            pass
+        records = []
+        for position, line in enumerate(data.rstrip(b'\n').split(b'\n')):
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict) or 'payment_id' not in record:
+                    raise ValueError("not a payment record")
+            except ValueError as e:
+                message = f"{path.name} line {position + 1}: {e}"
+                if errors is None:
+                    print(f"Skipping corrupt record in {message}")
+                else:
+                    errors.append(message)
+                continue
+            records.append(record)
+        return records
+
+    def _load_sealed_indexes(self):
+        """Merge the index files of sealed segments into ``self.index``"""
+        for number in self.unloaded_segments:
+            with open(self._index_path(number), 'r', encoding='utf-8') as f:
+                for record_id, (offset, length) in json.load(f).items():
+                    self.index[record_id] = (number, offset, length)
+        self.unloaded_segments = []
+
+    def get(self, record_id):
+        """Read a single record back through the segment indexes"""
+        with self.lock:
+            if self.unloaded_segments and record_id not in self.active_index:
+                self._load_sealed_indexes()
+            if record_id in self.active_index:
+                number = self.segment_number
+                offset, length = self.active_index[record_id]
+            elif record_id in self.index:
+                number, offset, length = self.index[record_id]
+            else:
+                return None
+        with open(self._segment_path(number), 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def close(self):
+        """Close the active segment file"""
+        with self.lock:
+            self.active_file.close()
@@ -1,7 +1,16 @@
 from enum import Enum
 import json
-from datetime import datetime
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, date, timedelta
 from pathlib import Path
+from collections import Counter
 
 class TaskPriority(Enum):
     """Task priority levels"""
@@ -26,6 +35,7 @@ class UserRole(Enum):
 class Task:
     """Represents a task in the todo system"""
     def __init__(self, description, owner, deadline, priority=TaskPriority.MEDIUM, created_by=None):
+        self.id = str(uuid.uuid4())
         self.description = description
         self.owner = owner
         self.deadline = deadline
@@ -52,6 +62,7 @@ class Task:
     def to_dict(self):
         """Convert task to dictionary for serialization"""
         return {
+            "id": self.id,
             "description": self.description,
             "owner": self.owner,
             "deadline": self.deadline,
@@ -61,7 +72,7 @@ class Task:
             "last_edited": self.last_edited,
             "status": self.status.value,
             "reviewer": self.reviewer,
-            "feedback_history": self.feedback_history,
+            "feedback_history": list(self.feedback_history),
             "archived": self.archived,
             "archived_date": self.archived_date
         }
@@ -76,6 +87,8 @@ class Task:
             priority=TaskPriority(data["priority"]),
             created_by=data["created_by"]
         )
+        # Tasks saved before ids existed keep the fresh one from __init__
+        task.id = data.get("id") or task.id
         task.creation_date = data["creation_date"]
         task.last_edited = data["last_edited"]
         task.status = TaskStatus(data["status"])
@@ -85,56 +98,481 @@ class Task:
         task.archived_date = data["archived_date"]
         return task
 
+# Words for full-text search: runs of letters and digits
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text):
+    """Lowercase search tokens of a piece of text"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+# Task.to_dict writes the id first, so archive scans can skip JSON parsing
+ARCHIVE_ID_PATTERN = re.compile(rb'^\{"id":\s*"([^"\\]+)"')
+
+class TaskArchive:
+    """Append-only store of archived tasks, one JSON line each.
+
+    Nothing is read until the archive is first queried; then a single byte
+    scan records where each line starts, and pages are parsed on demand.
+    """
+    def __init__(self, archive_file):
+        self.archive_file = Path(archive_file)
+        self.lock = threading.Lock()
+        self._offsets = None  # task id -> (offset, length) in archive order
+
+    def _load_index(self):
+        """Index line offsets by task id, truncating a torn final line"""
+        if self._offsets is not None:
+            return
+        self._offsets = {}
+        if not self.archive_file.exists():
+            return
+        with open(self.archive_file, 'rb') as f:
+            lines = f.read().split(b'\n')
+        offset = 0
+        for line in lines[:-1]:
+            match = ARCHIVE_ID_PATTERN.match(line)
+            if match:
+                task_id = match.group(1).decode('utf-8')
+                # A task archived again after a crash keeps its latest copy
+                self._offsets.pop(task_id, None)
+                self._offsets[task_id] = (offset, len(line) + 1)
+            offset += len(line) + 1
+        if offset != self.archive_file.stat().st_size:
+            with open(self.archive_file, 'r+b') as f:
+                f.truncate(offset)
+
+    def append(self, task):
+        """Durably add an archived task"""
+        line = (json.dumps(task.to_dict(), separators=(',', ':')) + '\n').encode('utf-8')
+        with self.lock:
+            self._load_index()
+            self.archive_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.archive_file, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._offsets.pop(task.id, None)
+            self._offsets[task.id] = (offset, len(line))
+
+    def count(self):
+        """Number of archived tasks"""
+        with self.lock:
+            self._load_index()
+            return len(self._offsets)
+
+    def get(self, task_id):
+        """Get an archived task by id, or None"""
+        with self.lock:
+            self._load_index()
+            position = self._offsets.get(task_id)
+        return self._read([position])[0] if position else None
+
+    def get_page(self, page, page_size=100):
+        """Get one page of archived tasks, most recently archived first"""
+        with self.lock:
+            self._load_index()
+            positions = list(self._offsets.values())
+        end = len(positions) - page * page_size
+        return self._read(reversed(positions[max(end - page_size, 0):max(end, 0)]))
+
+    def get_all(self):
+        """Get every archived task, oldest first"""
+        with self.lock:
+            self._load_index()
+            positions = list(self._offsets.values())
+        return self._read(positions)
+
+    def _read(self, positions):
+        """Parse the archive lines at the given (offset, length) positions"""
+        positions = list(positions)
+        tasks = []
+        # Nothing has been archived yet until the first archive_task
+        if not positions or not self.archive_file.exists():
+            return tasks
+        with open(self.archive_file, 'rb') as f:
+            for offset, length in positions:
+                f.seek(offset)
+                tasks.append(Task.from_dict(json.loads(f.read(length))))
+        return tasks
+
 class TodoManager:
-    """Manages tasks in the todo system"""
-    def __init__(self):
-        self.tasks = []
-        self.data_file = Path("todo_data.json")
+    """Manages tasks in the todo system.
+
+    Mutations are appended to a change journal next to the data file, one
+    small JSON record each. Records are buffered and written together once
+    mutations pause for SAVE_DELAY seconds, so a burst of edits costs one
+    write. A background thread also periodically compacts the journal into
+    a full snapshot in the data file; loading reads the snapshot and
+    replays the journal records newer than it.
+
+    Only active tasks live in the snapshot and in memory. Archiving moves a
+    task to a TaskArchive next to the data file, which is read lazily and
+    page by page.
+
+    Secondary indexes on owner, reviewer and status, plus a deadline-sorted
+    list of active tasks, are kept in step with every mutation so queries
+    cost O(result) instead of a full scan.
+
+    A min-heap of upcoming deadline events drives due-soon and overdue
+    alerts: ``check_deadlines`` pops only the events that are due, and
+    entries for completed, archived or deleted tasks are skipped when they
+    surface rather than searched for and removed.
+
+    An inverted index (token -> task id -> count) over descriptions and
+    feedback messages serves ``search_tasks``. Archived tasks stay in it
+    after archiving; those archived in earlier sessions are indexed on
+    the first search.
+    """
+    COMPACT_THRESHOLD = 500  # Journal records before a compaction is due
+    COMPACT_INTERVAL = 60  # Seconds between background compaction checks
+    SAVE_DELAY = 0.5  # Quiet period before buffered journal records are written
+    SAVE_MAX_DELAY = 5  # Longest a record waits during a continuous burst
+    INDEXED_FIELDS = ('owner', 'reviewer', 'status')
+    ARCHIVE_PAGE_SIZE = 100
+    DUE_SOON_DAYS = 3  # Same window the LG tab treats as urgent
+
+    def __init__(self, data_file="todo_data.json"):
+        self.tasks = {}  # task id -> Task, in creation order
+        self._indexes = {field: {} for field in self.INDEXED_FIELDS}  # field -> value -> {id: Task}
+        self._indexed_values = {}  # task id -> (field values, deadline) as currently indexed
+        self._deadlines = []  # sorted (deadline, task id) of active tasks
+        self._deadline_heap = []  # (event date ordinal, task id, 'due_soon' | 'overdue')
+        self._due_soon = {}  # task id -> Task inside the due-soon window
+        self._overdue = {}  # task id -> Task past its deadline
+        self._on_due_soon = None
+        self._on_overdue = None
+        self._text_index = {}  # token -> {task id: occurrences}
+        self._task_terms = {}  # task id -> Counter of its indexed tokens
+        self._archive_text_indexed = False
+        self.data_file = Path(data_file)
+        self._archive = None
+        self.lock = threading.RLock()
+        self.journal_seq = 0  # Sequence number of the last journaled change
+        self.snapshot_seq = 0  # Sequence number covered by the snapshot
+        self._journal = None
+        self._pending = []  # Journal lines waiting for the quiet period
+        self._burst_start = None  # When the oldest pending line was added
+        self._last_change = None  # When the newest pending line was added
+        self._saver = None
+        self._wake_saver = threading.Event()
+        self._stop_saver = threading.Event()
+        self._save_lock = threading.Lock()
         self.load_tasks()
 
+    @property
+    def journal_file(self):
+        """Change journal stored next to the data file"""
+        return self.data_file.with_suffix('.journal')
+
+    @property
+    def archive(self):
+        """Archive store stored next to the data file"""
+        archive_file = self.data_file.with_name(f"{self.data_file.stem}_archive.jsonl")
+        if self._archive is None or self._archive.archive_file != archive_file:
+            self._archive = TaskArchive(archive_file)
+        return self._archive
+
     def add_task(self, task):
         """Add a new task"""
-        self.tasks.append(task)
-        self.save_tasks()
+        with self.lock:
+            self.tasks[task.id] = task
+            self._index_task(task)
+            self._index_task_text(task)
+            self._journal_change({'op': 'add', 'task': task.to_dict()})
 
     def get_active_tasks(self):
         """Get all non-archived tasks"""
-        return [task for task in self.tasks if not task.archived]
+        with self.lock:
+            return list(self.tasks.values())
 
     def get_archived_tasks(self):
-        """Get all archived tasks"""
-        return [task for task in self.tasks if task.archived]
+        """Get all archived tasks (reads the whole archive)"""
+        return self.archive.get_all()
+
+    def get_archived_page(self, page, page_size=ARCHIVE_PAGE_SIZE):
+        """Get one page of archived tasks, most recently archived first"""
+        return self.archive.get_page(page, page_size)
+
+    def get_archived_count(self):
+        """Number of archived tasks"""
+        return self.archive.count()
+
+    def find_tasks(self, **criteria):
+        """Get tasks matching every given indexed field exactly.
+
+        e.g. ``find_tasks(reviewer='bob', status=TaskStatus.SUBMITTED)``
+        """
+        unknown = set(criteria) - set(self.INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot query tasks by {', '.join(sorted(unknown))}")
+        if not criteria:
+            return self.get_active_tasks()
+
+        with self.lock:
+            # Walk the smallest matching bucket and check the other fields on it
+            buckets = [self._indexes[field].get(value, {}) for field, value in criteria.items()]
+            smallest = min(buckets, key=len)
+            return [task for task_id, task in smallest.items()
+                    if all(task_id in bucket for bucket in buckets)]
+
+    def get_tasks_by_deadline(self, start=None, end=None):
+        """Get active tasks with start <= deadline <= end, earliest first"""
+        with self.lock:
+            low = bisect.bisect_left(self._deadlines, (start,)) if start else 0
+            high = bisect.bisect_right(self._deadlines, (end, '\uffff')) if end else len(self._deadlines)
+            return [self.tasks[task_id] for _, task_id in self._deadlines[low:high]]
+
+    def _index_task(self, task):
+        """Move a task to the index buckets matching its current fields"""
+        values = tuple(getattr(task, field) for field in self.INDEXED_FIELDS)
+        deadline = task.deadline
+        old_values, old_deadline = self._indexed_values.get(task.id, ((None,) * len(values), None))
+        is_new = task.id not in self._indexed_values
+
+        for field, old, new in zip(self.INDEXED_FIELDS, old_values, values):
+            if old == new and not is_new:
+                continue
+            if not is_new:
+                bucket = self._indexes[field][old]
+                del bucket[task.id]
+                if not bucket:
+                    del self._indexes[field][old]
+            self._indexes[field].setdefault(new, {})[task.id] = task
+
+        if old_deadline != deadline or is_new:
+            if not is_new:
+                self._deadlines.pop(bisect.bisect_left(self._deadlines, (old_deadline, task.id)))
+            bisect.insort(self._deadlines, (deadline, task.id))
+        self._indexed_values[task.id] = (values, deadline)
+
+        if is_new:
+            self._schedule_task(task)
+        elif task.status == TaskStatus.COMPLETED:
+            self._unschedule_task(task.id)
+
+    def _unindex_task(self, task_id):
+        """Remove a task from every index"""
+        values, deadline = self._indexed_values.pop(task_id)
+        self._unschedule_task(task_id)
+        for field, value in zip(self.INDEXED_FIELDS, values):
+            bucket = self._indexes[field][value]
+            del bucket[task_id]
+            if not bucket:
+                del self._indexes[field][value]
+        self._deadlines.pop(bisect.bisect_left(self._deadlines, (deadline, task_id)))
+
+    def _rebuild_indexes(self):
+        """Index every loaded task from scratch"""
+        self._indexes = {field: {} for field in self.INDEXED_FIELDS}
+        self._indexed_values = {}
+        self._deadlines = []
+        self._deadline_heap = []
+        self._due_soon = {}
+        self._overdue = {}
+        self._text_index = {}
+        self._task_terms = {}
+        self._archive_text_indexed = False
+        for task in self.tasks.values():
+            self._index_task(task)
+            self._index_task_text(task)
+
+    def _index_text(self, task_id, *texts):
+        """Add the tokens of some of a task's text to the search index"""
+        terms = Counter(token for text in texts for token in tokenize(text))
+        self._task_terms.setdefault(task_id, Counter()).update(terms)
+        for token, count in terms.items():
+            postings = self._text_index.setdefault(token, {})
+            postings[task_id] = postings.get(task_id, 0) + count
+
+    def _index_task_text(self, task):
+        """Index a task's description and all of its feedback messages"""
+        self._index_text(task.id, task.description,
+                         *(entry.get('message') for entry in task.feedback_history))
+
+    def _unindex_text(self, task_id):
+        """Remove a task from the search index"""
+        for token in self._task_terms.pop(task_id, ()):
+            postings = self._text_index[token]
+            del postings[task_id]
+            if not postings:
+                del self._text_index[token]
+
+    def _index_archive_text(self):
+        """Index tasks archived in earlier sessions, once (caller holds the lock)"""
+        if self._archive_text_indexed:
+            return
+        for task in self.archive.get_all():
+            if task.id not in self._task_terms:
+                self._index_task_text(task)
+        self._archive_text_indexed = True
+
+    def search_tasks(self, query, limit=50):
+        """Get active and archived tasks containing every word of the query, best match first.
+
+        Matches are ranked by TF-IDF: words that are rare across tasks and
+        frequent within a task count most.
+        """
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+
+        with self.lock:
+            self._index_archive_text()
+            postings = [self._text_index.get(token, {}) for token in tokens]
+            postings.sort(key=len)
+            if not postings[0]:
+                return []
+
+            total = len(self._task_terms)
+            weights = [math.log(1 + total / len(posting)) for posting in postings]
+            scores = {}
+            # Intersect from the rarest token outward
+            for task_id, count in postings[0].items():
+                score = count * weights[0]
+                for posting, weight in zip(postings[1:], weights[1:]):
+                    occurrences = posting.get(task_id)
+                    if occurrences is None:
+                        break
+                    score += occurrences * weight
+                else:
+                    scores[task_id] = score
+
+            ranked = heapq.nlargest(limit, scores, key=scores.get)
+            results = []
+            for task_id in ranked:
+                task = self.tasks.get(task_id) or self.archive.get(task_id)
+                if task is not None:
+                    results.append(task)
+            return results
+
+    def _schedule_task(self, task):
+        """Queue the due-soon alert of a new, open task"""
+        if task.status == TaskStatus.COMPLETED:
+            return
+        try:
+            deadline = date.fromisoformat(task.deadline)
+        except (TypeError, ValueError):
+            return
+        due_soon = deadline - timedelta(days=self.DUE_SOON_DAYS)
+        heapq.heappush(self._deadline_heap, (due_soon.toordinal(), task.id, 'due_soon'))
+
+    def _unschedule_task(self, task_id):
+        """Clear a task's alerts; its heap entries are dropped when they surface"""
+        self._due_soon.pop(task_id, None)
+        self._overdue.pop(task_id, None)
+
+    def register_deadline_callbacks(self, on_due_soon=None, on_overdue=None):
+        """Set the functions check_deadlines calls with each newly due-soon or overdue task"""
+        self._on_due_soon = on_due_soon
+        self._on_overdue = on_overdue
+
+    def check_deadlines(self, today=None):
+        """Fire the deadline events that are due; call this from a timer"""
+        today = (today or date.today()).toordinal()
+        fired = []
+        with self.lock:
+            while self._deadline_heap and self._deadline_heap[0][0] <= today:
+                _, task_id, event = heapq.heappop(self._deadline_heap)
+                task = self.tasks.get(task_id)
+                if task is None or task.status == TaskStatus.COMPLETED:
+                    continue  # Stale entry for a finished, archived or deleted task
+                if event == 'due_soon':
+                    self._due_soon[task_id] = task
+                    # Overdue the day after the deadline
+                    overdue = date.fromisoformat(task.deadline) + timedelta(days=1)
+                    heapq.heappush(self._deadline_heap, (overdue.toordinal(), task_id, 'overdue'))
+                    fired.append((self._on_due_soon, task))
+                else:
+                    self._due_soon.pop(task_id, None)
+                    self._overdue[task_id] = task
+                    fired.append((self._on_overdue, task))
+
+        # Callbacks run outside the lock so they may query the manager
+        for callback, task in fired:
+            if callback is not None:
+                try:
+                    callback(task)
+                except Exception as e:
+                    print(f"Error in deadline callback: {str(e)}")
+        return len(fired)
+
+    def get_due_soon_tasks(self):
+        """Open tasks inside the due-soon window, as of the last check"""
+        with self.lock:
+            return list(self._due_soon.values())
+
+    def get_overdue_tasks(self):
+        """Open tasks past their deadline, as of the last check"""
+        with self.lock:
+            return list(self._overdue.values())
+
+    def get_deadline_alert(self, task_id):
+        """'overdue', 'due_soon' or None for a task, as of the last check"""
+        if task_id in self._overdue:
+            return 'overdue'
+        if task_id in self._due_soon:
+            return 'due_soon'
+        return None
+
+    def get_task(self, task_id):
+        """Get a task by its id, or None"""
+        return self.tasks.get(task_id)
+
+    def _is_managed(self, task):
+        """Whether the task object is the one this manager holds for its id"""
+        return task is not None and self.tasks.get(task.id) is task
 
     def update_task_status(self, task, new_status, user, feedback=None):
         """Update task status with validation"""
-        if task not in self.tasks:
+        if not self._is_managed(task):
             raise ValueError("Task not found")
 
         # Validate status transition
         if not self._is_valid_status_transition(task, new_status, user):
             raise ValueError(f"Invalid status transition from {task.status.value} to {new_status.value} by {user}")
 
-        task.status = new_status
-        task.last_edited = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        if feedback is not None:
-            task.add_feedback(user, feedback)
+        with self.lock:
+            task.status = new_status
+            task.last_edited = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            
+            if feedback is not None:
+                task.add_feedback(user, feedback)
+
+            self._index_task(task)
+            if feedback is not None:
+                self._index_text(task.id, feedback)
+            self._journal_update(task, ['status', 'last_edited'],
+                                 task.feedback_history[-1] if feedback is not None else None)
 
-        self.save_tasks()
+    def add_feedback(self, task, user, message):
+        """Add feedback to a task"""
+        if not self._is_managed(task):
+            raise ValueError("Task not found")
+
+        with self.lock:
+            task.add_feedback(user, message)
+            self._index_text(task.id, message)
+            self._journal_update(task, ['last_edited'], task.feedback_history[-1])
 
     def assign_reviewer(self, task, reviewer):
         """Assign a reviewer to a task"""
-        if task not in self.tasks:
+        if not self._is_managed(task):
             raise ValueError("Task not found")
 
-        task.reviewer = reviewer
-        task.last_edited = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.save_tasks()
+        with self.lock:
+            task.reviewer = reviewer
+            task.last_edited = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._index_task(task)
+            self._journal_update(task, ['reviewer', 'last_edited'])
 
     def archive_task(self, task, user=None):
         """Archive a task. Only task owner, reviewer, or admin can archive."""
         if not task:
             raise ValueError("Task cannot be None")
+
+        if not self._is_managed(task):
+            raise ValueError("Task not found")
             
         if user is None:
             raise ValueError("User must be specified for archiving")
@@ -147,41 +585,228 @@ class TodoManager:
         if not (is_owner or is_reviewer or is_admin):
             raise ValueError("Only task owner, reviewer, or admin can archive tasks")
 
-        task.archived = True
-        task.archived_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.save_tasks()
+        with self.lock:
+            task.archived = True
+            task.archived_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._move_to_archive(task)
+            self._journal_change({'op': 'archive', 'id': task.id})
 
-    def save_tasks(self):
-        """Save tasks to file"""
+    def _move_to_archive(self, task):
+        """Write an archived task to the archive store and drop it from the active set"""
+        # Archive first: a crash in between leaves a duplicate, never a lost task
+        self.archive.append(task)
+        del self.tasks[task.id]
+        self._unindex_task(task.id)
+
+    def delete_task(self, task_id):
+        """Remove a task permanently"""
+        with self.lock:
+            if task_id not in self.tasks:
+                raise ValueError("Task not found")
+            del self.tasks[task_id]
+            self._unindex_task(task_id)
+            self._unindex_text(task_id)
+            self._journal_change({'op': 'delete', 'id': task_id})
+
+    def _journal_update(self, task, fields, feedback=None):
+        """Journal changed fields (and a new feedback entry) of an existing task"""
+        data = task.to_dict()
+        record = {
+            'op': 'update',
+            'id': task.id,
+            'fields': {field: data[field] for field in fields}
+        }
+        if feedback is not None:
+            record['feedback'] = feedback
+        self._journal_change(record)
+
+    def _journal_change(self, record):
+        """Buffer one change record for the next journal write"""
+        with self.lock:
+            self.journal_seq += 1
+            record['seq'] = self.journal_seq
+            self._pending.append(json.dumps(record, separators=(',', ':')) + '\n')
+            self._last_change = time.monotonic()
+            if self._burst_start is None:
+                self._burst_start = self._last_change
+        self._start_saver()
+        self._wake_saver.set()
+
+    def _flush_due(self):
+        """When the buffered records should be written, or None (caller holds the lock)"""
+        if not self._pending:
+            return None
+        return min(self._last_change + self.SAVE_DELAY, self._burst_start + self.SAVE_MAX_DELAY)
+
+    def flush_journal(self):
+        """Write all buffered journal records in one append"""
         try:
-            data = {
-                'tasks': [task.to_dict() for task in self.tasks],
-                'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            # Ensure parent directory exists
-            self.data_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
+            with self.lock:
+                if not self._pending:
+                    return
+                if self._journal is None:
+                    self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+                    self._journal = open(self.journal_file, 'a', encoding='utf-8')
+                self._journal.write(''.join(self._pending))
+                self._journal.flush()
+                self._pending = []
+                self._burst_start = self._last_change = None
         except Exception as e:
             print(f"Error saving tasks: {str(e)}")
 
+    def _apply_change(self, record):
+        """Replay one journal record onto the in-memory tasks"""
+        if record['op'] == 'add':
+            task = Task.from_dict(record['task'])
+            self.tasks[task.id] = task
+            return
+        if record['op'] in ('delete', 'archive'):
+            # Archived tasks were written to the archive store before the record
+            self.tasks.pop(record['id'], None)
+            return
+        task = self.tasks[record['id']]
+        fields = record.get('fields', {})
+        if 'status' in fields:
+            task.status = TaskStatus(fields['status'])
+        for field in ('reviewer', 'last_edited', 'archived', 'archived_date'):
+            if field in fields:
+                setattr(task, field, fields[field])
+        if 'feedback' in record:
+            task.feedback_history.append(record['feedback'])
+
+    def _start_saver(self):
+        """Start the background save thread once"""
+        with self.lock:
+            if self._saver is None:
+                self._saver = threading.Thread(target=self._save_loop,
+                                               name="todo-saver", daemon=True)
+                self._saver.start()
+
+    def _save_loop(self):
+        """Write buffered records after the quiet period; compact on the interval or threshold"""
+        last_compaction = time.monotonic()
+        while True:
+            with self.lock:
+                flush_at = self._flush_due()
+            timeout = last_compaction + self.COMPACT_INTERVAL - time.monotonic()
+            if flush_at is not None:
+                timeout = min(timeout, flush_at - time.monotonic())
+            self._wake_saver.wait(max(timeout, 0))
+            self._wake_saver.clear()
+            if self._stop_saver.is_set():
+                return
+
+            now = time.monotonic()
+            with self.lock:
+                flush_at = self._flush_due()
+            if flush_at is not None and now >= flush_at:
+                self.flush_journal()
+            if (self.journal_seq - self.snapshot_seq >= self.COMPACT_THRESHOLD
+                    or now - last_compaction >= self.COMPACT_INTERVAL):
+                if self.journal_seq > self.snapshot_seq:
+                    self.save_tasks()
+                last_compaction = now
+
+    def save_tasks(self):
+        """Compact: write a full snapshot and truncate the journal it covers"""
+        with self._save_lock:
+            try:
+                with self.lock:
+                    seq = self.journal_seq
+                    data = {
+                        'tasks': [task.to_dict() for task in self.tasks.values()],
+                        'last_updated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        'journal_seq': seq
+                    }
+                
+                # Ensure parent directory exists
+                self.data_file.parent.mkdir(parents=True, exist_ok=True)
+                
+                # The snapshot is written outside the lock, mutations keep journaling
+                temp_file = self.data_file.with_suffix('.tmp')
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.data_file)
+                
+                with self.lock:
+                    self.snapshot_seq = max(self.snapshot_seq, seq)
+                    # Records newer than the snapshot stay; replay skips the rest
+                    if self.journal_seq == seq:
+                        if self._journal is not None:
+                            self._journal.close()
+                        self._journal = open(self.journal_file, 'w', encoding='utf-8')
+                        self._pending = []
+                        self._burst_start = self._last_change = None
+            except Exception as e:
+                print(f"Error saving tasks: {str(e)}")
+
     def load_tasks(self):
-        """Load tasks from file"""
+        """Load tasks from the snapshot and replay newer journal records"""
         try:
+            self.tasks = {}
+            self.journal_seq = self.snapshot_seq = 0
+            missing_ids = False
             if self.data_file.exists():
                 with open(self.data_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     if isinstance(data, dict) and 'tasks' in data:
-                        self.tasks = [Task.from_dict(task_data) for task_data in data['tasks']]
-                    else:
-                        self.tasks = []
-            else:
-                self.tasks = []
+                        for task_data in data['tasks']:
+                            task = Task.from_dict(task_data)
+                            self.tasks[task.id] = task
+                            missing_ids = missing_ids or 'id' not in task_data
+                        self.journal_seq = self.snapshot_seq = data.get('journal_seq', 0)
+            if self.journal_file.exists():
+                self._replay_journal()
+
+            # Older files kept archived tasks inline; move them to the archive store
+            archived = [task for task in self.tasks.values() if task.archived]
+            for task in archived:
+                if self.archive.get(task.id) is None:
+                    self.archive.append(task)
+                del self.tasks[task.id]
+
+            if missing_ids or archived:
+                # Persist assigned ids and the move before any journal record refers to them
+                self.save_tasks()
         except Exception as e:
             print(f"Error loading tasks: {str(e)}")
-            self.tasks = []
+            self.tasks = {}
+        self._rebuild_indexes()
+
+    def _replay_journal(self):
+        """Apply journal records newer than the snapshot, dropping a torn tail"""
+        offset = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    break  # Torn final record from a crash
+                if record['seq'] > self.journal_seq:
+                    self._apply_change(record)
+                    self.journal_seq = record['seq']
+                offset += len(line)
+        if offset != self.journal_file.stat().st_size:
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(offset)
+
+    def close(self):
+        """Stop the background save thread and write a final snapshot"""
+        self._stop_saver.set()
+        self._wake_saver.set()
+        if self._saver is not None:
+            self._saver.join()
+        self.flush_journal()
+        if self.journal_seq > self.snapshot_seq:
+            self.save_tasks()
+        with self.lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
 
     def _is_valid_status_transition(self, task, new_status, user):
         """Validate status transition based on current status and user role"""